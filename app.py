@@ -1,9 +1,10 @@
-from gemini_video_assemble.config import Settings
+from gemini_video_assemble.config import get_settings
 from gemini_video_assemble.config_store import ConfigStore
 from gemini_video_assemble.server import create_app
 
-app = create_app()
-
+# WSGI servers build the app through the factory: gunicorn "app:create_app()".
+# Spawned render processes re-import this file, so nothing is created at import time.
 if __name__ == "__main__":
-    settings = Settings.from_sources(ConfigStore().load())
+    app = create_app()
+    settings = get_settings(ConfigStore().load())
     app.run(host="0.0.0.0", port=settings.port, debug=True)
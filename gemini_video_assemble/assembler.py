@@ -1,14 +1,24 @@
+import logging
+import queue
 import re
-import textwrap
+import tempfile
+import threading
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 from moviepy import (
+    AudioClip,
     AudioFileClip,
     CompositeVideoClip,
     CompositeAudioClip,
     ImageClip,
     TextClip,
+    VideoClip,
     VideoFileClip,
     ColorClip,
     concatenate_videoclips,
@@ -16,11 +26,287 @@ from moviepy import (
     vfx,
     afx,
 )
-import platform
+from PIL import Image
+
+from .ffmpeg_tools import (
+    FilterGraph,
+    audio_duration,
+    encode_frames,
+    escape_filter_value,
+    loop_audio,
+    media_duration,
+    mux_audio,
+    probe_audio,
+    run_ffmpeg,
+    trim_media,
+    video_encoder_args,
+    write_concat_list,
+)
+from .fileio import scratch_root
 from .models import Scene
 
+logger = logging.getLogger(__name__)
+
+KENBURNS_LEVELS = 16
+SUBTITLE_MAX_WORDS = 6
+_WORD_RE = re.compile(r"\S+")
+# Scenes prepared ahead of the one being composed when building without an executor.
+READ_AHEAD_DEPTH = 2
+# Narration at or above this AAC bitrate is muxed into segments without re-encoding.
+COPY_AUDIO_MIN_BITRATE = 128_000
+AAC_SUFFIXES = (".m4a", ".aac")
+# Headroom kept when trimming stock footage so the cut never ends short of the narration.
+TRIM_MARGIN_SEC = 0.5
+
+FONT_SUFFIXES = (".ttf", ".ttc", ".otf")
+FONT_FALLBACKS = (
+    "Arial.ttf",                     # Standard Windows
+    "arial.ttf",                     # Standard lowercase
+    "Helvetica.ttc",                 # Standard macOS
+    "DejaVuSans.ttf",                # Standard Linux
+    "LiberationSans-Regular.ttf",    # Common Linux alternative
+)
+
+
+# Narration rarely repeats across renders, so only a scene's worth of segments is kept.
+RASTER_CACHE_SIZE = 32
+
+
+@lru_cache(maxsize=RASTER_CACHE_SIZE)
+def _rasterize_text(
+    text: str,
+    font: str,
+    fontsize: int,
+    color: str,
+    stroke_color: str,
+    stroke_width: int,
+    box_width: Optional[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Render text once to (rgb, uint8 mask) arrays; repeated segments become a dict lookup."""
+    clip = TextClip(
+        text=text,
+        font=font,
+        font_size=fontsize,
+        color=color,
+        stroke_color=stroke_color,
+        stroke_width=stroke_width,
+        method="caption",
+        size=(box_width, None) if box_width else None,
+    )
+    rgb = clip.get_frame(0)
+    if clip.mask is not None:
+        # uint8 rather than float64: an eighth of the memory held by the cache and pickled to workers.
+        mask = np.rint(clip.mask.get_frame(0) * 255).astype(np.uint8)
+    else:
+        mask = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+    # Cached arrays are shared between clips, so keep them immutable.
+    rgb.setflags(write=False)
+    mask.setflags(write=False)
+    return rgb, mask
+
+
+@dataclass
+class SubtitleCue:
+    """Text and timing of one subtitle segment, relative to its scene."""
+
+    text: str
+    start: float
+    duration: float
+    fontsize: int
+    effect: int
+
+
+@dataclass
+class OverlayDescriptor:
+    """A pre-rasterized subtitle segment, safe to pickle between processes."""
+
+    rgb: np.ndarray
+    mask: np.ndarray  # uint8, 0-255
+    start: float
+    duration: float
+    effect: int
+
+
+@dataclass
+class SceneDescriptor:
+    """Paths, timing and overlay data needed to rebuild a scene clip in the parent."""
+
+    idx: int
+    audio_path: Path
+    duration: float
+    visual_path: Path
+    is_video: bool
+    sfx_path: Optional[Path] = None
+    overlays: List[OverlayDescriptor] = field(default_factory=list)
+    # Filled instead of ``overlays`` when ffmpeg draws the subtitles.
+    cues: List[SubtitleCue] = field(default_factory=list)
+
+
+# Scale animations are quantized to this many steps; each step's bitmap is rasterized once.
+EFFECT_LUT_SIZE = 32
+_LUT_PROGRESS = np.linspace(0.0, 1.0, EFFECT_LUT_SIZE)
+_SCALE_LUTS = {
+    0: 0.5 + 0.5 * _LUT_PROGRESS,  # Pop-in: scale from 0.5 to 1.0
+    2: 0.7 + 0.5 * (1 - (_LUT_PROGRESS - 1) ** 2),  # Bounce: scale from 0.7 up to 1.2
+    3: 0.6 + 0.4 * _LUT_PROGRESS,  # Zoom in: 0.6 to 1.0
+}
+
+
+def _scale_anim_duration(effect: int, duration: float) -> float:
+    return {0: min(0.2, duration * 0.3), 2: 0.25, 3: 0.15}.get(effect, 0.0)
+
+
+def _effect_scale_level(effect: int, t: float, duration: float) -> Optional[int]:
+    """LUT index of a subtitle segment's scale ``t`` seconds after it appears, or None at full size."""
+    anim = _scale_anim_duration(effect, duration)
+    if t >= anim:
+        return None
+    return min(int(t / anim * (EFFECT_LUT_SIZE - 1)), EFFECT_LUT_SIZE - 1)
+
+
+def _effect_alpha(effect: int, t: float, duration: float) -> float:
+    """Opacity of a subtitle segment: per-effect fade in, shared fade out."""
+    alpha = 1.0
+    fade_in = {1: 0.15, 3: 0.1}.get(effect)
+    if fade_in and t < fade_in:
+        alpha = t / fade_in
+    # Add fade out at the end for all effects
+    if duration > 0.3 and t > duration - 0.2:
+        alpha = min(alpha, max(0.0, (duration - t) / 0.2))
+    return alpha
+
+
+def _cue_alpha_expr(cue: SubtitleCue, start: float) -> str:
+    """drawtext alpha expression mirroring ``_effect_alpha`` on the output timeline.
+
+    drawtext cannot scale per frame, so the pop-in and bounce effects fade in
+    over their scale window instead.
+    """
+    fade_in = {1: 0.15, 3: 0.1}.get(cue.effect) or _scale_anim_duration(cue.effect, cue.duration)
+    terms = []
+    if fade_in:
+        terms.append(f"(t-{start:.3f})/{fade_in:.3f}")
+    if cue.duration > 0.3:
+        terms.append(f"({start + cue.duration:.3f}-t)/0.2")
+    alpha = "1"
+    for term in terms:
+        alpha = f"min({alpha},{term})"
+    return f"max(0,{alpha})"
+
+
+def _centered_in_box(
+    rgb: np.ndarray, mask: np.ndarray, box: Tuple[int, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(rgb, float mask) padded to ``box`` (width, height) from a bitmap with a uint8 mask."""
+    width, height = box
+    bh, bw = mask.shape[:2]
+    x, y = (width - bw) // 2, (height - bh) // 2
+    canvas_rgb = np.zeros((height, width, 3), dtype=np.uint8)
+    canvas_mask = np.zeros((height, width))
+    canvas_rgb[y:y + bh, x:x + bw] = rgb
+    canvas_mask[y:y + bh, x:x + bw] = mask / 255.0
+    return canvas_rgb, canvas_mask
+
+
+def _trim_to_duration(video_path: Path, duration: float) -> Path:
+    """Pre-cut long stock footage so only the needed range is demuxed and decoded."""
+    try:
+        if media_duration(video_path) <= duration + TRIM_MARGIN_SEC:
+            return video_path
+        trimmed = video_path.with_name(f"{video_path.stem}_trimmed{video_path.suffix}")
+        return trim_media(video_path, trimmed, duration + TRIM_MARGIN_SEC)
+    except Exception as e:
+        logger.warning("Could not trim %s: %s", video_path, e)
+        return video_path
+
+
+def _build_scene(scene: Scene, idx: int, cfg: "VideoAssembler") -> SceneDescriptor:
+    """Prepare one scene without returning MoviePy objects (they don't pickle well)."""
+    if not scene.audio_path:
+        raise RuntimeError("Scene missing audio")
+    duration = audio_duration(Path(scene.audio_path))
+
+    if scene.video_path and Path(scene.video_path).exists():
+        visual_path, is_video = Path(scene.video_path), True
+    elif scene.image_path and Path(scene.image_path).exists():
+        visual_path, is_video = Path(scene.image_path), False
+    else:
+        raise RuntimeError("Scene missing visual asset")
+
+    if is_video:
+        visual_path = _trim_to_duration(visual_path, duration)
+
+    sfx_path = Path(scene.sfx_path) if scene.sfx_path and Path(scene.sfx_path).exists() else None
+    desc = SceneDescriptor(
+        idx=idx,
+        audio_path=Path(scene.audio_path),
+        duration=duration,
+        visual_path=visual_path,
+        is_video=is_video,
+        sfx_path=sfx_path,
+    )
+
+    if cfg.enable_subtitles and scene.subtitle:
+        cues = cfg._subtitle_cues(scene.subtitle, duration)
+        if cfg.subtitle_renderer == "drawtext":
+            desc.cues = cues
+            return desc
+        box_width = cfg._subtitle_box_width(visual_path, is_video)
+        for cue in cues:
+            raster = cfg._text_raster(cue.text, box_width, cue.fontsize)
+            if raster is None:
+                continue
+            rgb, mask = raster
+            desc.overlays.append(
+                OverlayDescriptor(
+                    rgb=rgb,
+                    mask=mask,
+                    start=cue.start,
+                    duration=cue.duration,
+                    effect=cue.effect,
+                )
+            )
+    return desc
+
+
+def _render_scene_segment(scene: Scene, idx: int, cfg: "VideoAssembler", dest: Path) -> Tuple[Path, float]:
+    """Encode one scene to ``dest``; transitions are added later by the ffmpeg join."""
+    desc = _build_scene(scene, idx, cfg)
+    clip = cfg._hydrate_scene(desc, fade_in=False)
+    filters = [cfg._cue_filter(cue) for cue in desc.cues]
+    if cfg._can_copy_audio(desc):
+        # Narration is already AAC and nothing is mixed into it: skip MoviePy's audio encode.
+        video_only = dest.with_name(f"{dest.stem}_video{dest.suffix}")
+        cfg._write_clip(clip.without_audio(), video_only, filters)
+        mux_audio(video_only, desc.audio_path, dest)
+        video_only.unlink(missing_ok=True)
+    else:
+        cfg._write_clip(clip, dest, filters)
+    return dest, clip.duration
+
+
+def _render_break_segment(scene: Scene, cfg: "VideoAssembler", dest: Path) -> Optional[Tuple[Path, float]]:
+    """Encode the chapter break titled with ``scene``; silent audio keeps streams uniform."""
+    clip = cfg._create_break_clip(scene, break_duration=2.5)
+    if clip is None:
+        return None
+    if clip.audio is None:
+        clip = clip.with_audio(_silence(clip.duration))
+    cfg._write_clip(clip, dest)
+    return dest, clip.duration
+
+
+def _silence(duration: float) -> AudioClip:
+    def frame(t):
+        return np.zeros((len(t), 2)) if isinstance(t, np.ndarray) else np.zeros(2)
+
+    return AudioClip(frame_function=frame, duration=duration, fps=44100)
+
 
 class VideoAssembler:
+    # Requested font -> first working font, so each new assembler skips the probe.
+    _GLOBAL_FONT_CACHE: Dict[Optional[str], Optional[str]] = {}
+
     def __init__(
         self,
         fps: int = 24,
@@ -29,6 +315,8 @@ class VideoAssembler:
         enable_subtitles: bool = True,
         subtitle_opts: Optional[Dict] = None,
         background_music_path: Optional[Path] = None,
+        segment_concat: bool = False,
+        subtitle_renderer: str = "bitmap",
     ):
         self.fps = fps
         self.crossfade_sec = crossfade_sec
@@ -37,14 +325,19 @@ class VideoAssembler:
         self.subtitle_opts = subtitle_opts or {}
         self.target_size = subtitle_opts.get("target_size") if subtitle_opts else None
         self.background_music_path = background_music_path
+        self.segment_concat = segment_concat
+        self.subtitle_renderer = subtitle_renderer
+        self._resolved_font = self._resolve_font()
 
     def _subtitle_segments(self, text: str, duration: float) -> List[Dict]:
         """Split subtitle text into paced segments to reduce crowding."""
-        if not text:
+        words = _WORD_RE.findall(text or "")
+        if not words:
             return []
-        words = text.strip().split()
-        max_words = 6
-        parts = [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
+        parts = [
+            " ".join(words[i:i + SUBTITLE_MAX_WORDS])
+            for i in range(0, len(words), SUBTITLE_MAX_WORDS)
+        ]
 
         seg_duration = duration / len(parts)
         segments = []
@@ -76,100 +369,185 @@ class VideoAssembler:
         else:
             return int(base_size * 0.85)  # Smaller (supporting)
 
-    def _apply_subtitle_effect(self, text_clip, effect_type: int, duration: float):
-        """Apply different effects based on effect type for variety."""
-        if effect_type == 0:  # Pop-in with scale
-            pop_duration = min(0.2, duration * 0.3)
-            def pop_anim(t):
-                if t < pop_duration:
-                    return 0.5 + 0.5 * (t / pop_duration)  # Scale from 0.5 to 1.0
-                return 1.0
-            text_clip = text_clip.resized(pop_anim)
-        elif effect_type == 1:  # Slide-in from left with fade
-            def slide_anim(t):
-                return 0.3 + 0.7 * (min(t, 0.2) / 0.2)  # Slide opacity from 0.3 to 1.0
-            # Use with FadeIn effect
-            text_clip = text_clip.with_effects([vfx.FadeIn(0.15)])
-        elif effect_type == 2:  # Bounce effect with scale
-            def bounce_anim(t):
-                bounce_dur = 0.25
-                if t < bounce_dur:
-                    # Bounce: scale from 0.7 up to 1.2 then settle to 1.0
-                    progress = t / bounce_dur
-                    return 0.7 + 0.5 * (1 - (progress - 1) ** 2)
-                return 1.0
-            text_clip = text_clip.resized(bounce_anim)
-        else:  # effect_type == 3: Rotate and zoom
-            def zoom_rotate(t):
-                if t < 0.15:
-                    return 0.6 + 0.4 * (t / 0.15)  # Zoom from 0.6 to 1.0
-                return 1.0
-            text_clip = text_clip.resized(zoom_rotate)
-            text_clip = text_clip.with_effects([vfx.FadeIn(0.1)])
-        
-        # Add fade out at the end for all effects
-        if duration > 0.3:
-            text_clip = text_clip.with_effects([vfx.FadeOut(0.2)])
-        
-        return text_clip
+    def _scaled_overlay(self, overlay: OverlayDescriptor, level: int, box: Tuple[int, int], cache: Dict):
+        """``overlay`` at LUT step ``level``, padded to ``box``; built once and reused for later frames."""
+        key = (id(overlay), level)
+        if key not in cache:
+            scale = _SCALE_LUTS[overlay.effect][level]
+            size = (max(1, int(overlay.rgb.shape[1] * scale)), max(1, int(overlay.rgb.shape[0] * scale)))
+            rgb = np.asarray(Image.fromarray(overlay.rgb).resize(size, Image.BILINEAR))
+            mask = np.asarray(Image.fromarray(overlay.mask).resize(size, Image.BILINEAR))
+            cache[key] = _centered_in_box(rgb, mask, box)
+        return cache[key]
 
-    def _create_text_clip(self, text: str, duration: float, box_width: Optional[int], fontsize: Optional[int] = None):
-        """Create a TextClip with font size adjusted for aspect ratio."""
-        # List of fonts to try in order
-        fonts_to_try = [
-            self.subtitle_opts.get("font"),  # Try user input first
-            "Arial.ttf",                     # Standard Windows
-            "arial.ttf",                     # Standard lowercase
-            "Helvetica.ttc",                 # Standard macOS
-            "DejaVuSans.ttf",                # Standard Linux
-            "LiberationSans-Regular.ttf",    # Common Linux alternative
-        ]
-        
+    def _overlay_clip(self, overlay: OverlayDescriptor, scaled: Dict):
+        """One segment as a clip the size of its bitmap, centered on the frame.
+
+        Only that box is blended into each frame. The full-size bitmap and each
+        LUT step of the scale-in are padded once, so frames reuse cached arrays
+        and only a fading mask is recomputed.
+        """
+        peak = float(_SCALE_LUTS[overlay.effect].max()) if overlay.effect in _SCALE_LUTS else 1.0
+        box = (int(overlay.rgb.shape[1] * max(1.0, peak)), int(overlay.rgb.shape[0] * max(1.0, peak)))
+        static = _centered_in_box(overlay.rgb, overlay.mask, box)
+
+        def bitmap(t):
+            level = _effect_scale_level(overlay.effect, t, overlay.duration)
+            if level is None:
+                return static
+            return self._scaled_overlay(overlay, level, box, scaled)
+
+        def mask(t):
+            box_mask = bitmap(t)[1]
+            alpha = _effect_alpha(overlay.effect, t, overlay.duration)
+            return box_mask if alpha >= 1.0 else box_mask * alpha
+
+        clip = VideoClip(frame_function=lambda t: bitmap(t)[0], duration=overlay.duration)
+        clip = clip.with_mask(VideoClip(frame_function=mask, is_mask=True, duration=overlay.duration))
+        return clip.with_start(overlay.start).with_position("center")
+
+    def _resolve_font(self) -> Optional[str]:
+        """First font that renders, probed once per requested font and shared by all instances."""
+        requested = self.subtitle_opts.get("font")
+        if requested not in VideoAssembler._GLOBAL_FONT_CACHE:
+            VideoAssembler._GLOBAL_FONT_CACHE[requested] = self._probe_fonts(requested)
+        return VideoAssembler._GLOBAL_FONT_CACHE[requested]
+
+    def _probe_fonts(self, requested: Optional[str]) -> Optional[str]:
+        candidates = [requested, *FONT_FALLBACKS]
         # Remove None values and duplicates
-        fonts_to_try = list(dict.fromkeys([f for f in fonts_to_try if f]))
-        
-        # Get font size (use provided or default)
-        if fontsize is None:
-            fontsize = self._get_subtitle_fontsize()
+        candidates = list(dict.fromkeys([f for f in candidates if f]))
         last_error = None
-
-        for font_name in fonts_to_try:
+        for font_name in candidates:
             try:
-                clip = TextClip(
-                    text=text,
-                    font=font_name,
-                    font_size=fontsize,
-                    color=self.subtitle_opts.get("color", "white"),
-                    stroke_color=self.subtitle_opts.get("stroke_color", "black"),
-                    stroke_width=self.subtitle_opts.get("stroke_width", 1),
-                    method="caption",
-                    size=(box_width, None) if box_width else None,
-                ).with_duration(duration)
-                
-                # If successful, return immediately
-                return clip
+                TextClip(text="A", font=font_name, font_size=12)
+                return font_name
             except Exception as e:
-                # Store error and try next font
                 last_error = e
-                continue
-
-        # If we run out of fonts, raise the last error so the user knows
-        print(f"Failed to render subtitle '{text}'. Last error: {last_error}")
+        logger.warning("No usable subtitle font found. Last error: %s", last_error)
         return None
 
+    def _clip_from_raster(self, rgb: np.ndarray, mask: np.ndarray, duration: float):
+        return ImageClip(rgb).with_mask(ImageClip(mask / 255.0, is_mask=True)).with_duration(duration)
+
+    def _text_raster(
+        self, text: str, box_width: Optional[int], fontsize: Optional[int] = None
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Rasterized (rgb, mask) arrays for subtitle text, served from the module cache."""
+        if not self._resolved_font:
+            return None
+        if fontsize is None:
+            fontsize = self._get_subtitle_fontsize()
+        try:
+            return _rasterize_text(
+                text,
+                self._resolved_font,
+                fontsize,
+                self.subtitle_opts.get("color", "white"),
+                self.subtitle_opts.get("stroke_color", "black"),
+                self.subtitle_opts.get("stroke_width", 1),
+                box_width,
+            )
+        except Exception as e:
+            logger.warning("Failed to render subtitle '%s': %s", text, e)
+            return None
+
+    def _create_text_clip(self, text: str, duration: float, box_width: Optional[int], fontsize: Optional[int] = None):
+        """Create a text clip with font size adjusted for aspect ratio."""
+        raster = self._text_raster(text, box_width, fontsize)
+        if raster is None:
+            return None
+        return self._clip_from_raster(*raster, duration)
+
+    def _subtitle_cues(self, text: str, duration: float) -> List[SubtitleCue]:
+        segments = self._subtitle_segments(text, duration)
+        return [
+            SubtitleCue(
+                text=seg["text"],
+                start=seg["start"],
+                duration=seg["duration"],
+                # Get interactive font size (varies by segment index)
+                fontsize=self._get_interactive_fontsize(seg_idx, len(segments)),
+                effect=seg_idx % 4,  # Cycle through 4 different effects
+            )
+            for seg_idx, seg in enumerate(segments)
+        ]
+
+    def _font_option(self) -> str:
+        font = self._resolved_font or self.subtitle_opts.get("font") or "Sans"
+        if Path(font).is_file():
+            return f"fontfile={escape_filter_value(font)}"
+        if font.lower().endswith(FONT_SUFFIXES):
+            font = font.rsplit(".", 1)[0]
+        return f"font={escape_filter_value(font)}"
+
+    def _drawtext(self, text: str, fontsize: int, extra: str = "") -> str:
+        return (
+            f"drawtext={self._font_option()}:text={escape_filter_value(text)}:expansion=none"
+            f":fontsize={fontsize}"
+            f":fontcolor={self.subtitle_opts.get('color', 'white')}"
+            f":bordercolor={self.subtitle_opts.get('stroke_color', 'black')}"
+            f":borderw={self.subtitle_opts.get('stroke_width', 1)}"
+            f":x=(w-text_w)/2:y=(h-text_h)/2{extra}"
+        )
+
+    def _cue_filter(self, cue: SubtitleCue, offset: float = 0.0) -> str:
+        """drawtext filter showing ``cue`` on a timeline where its scene starts at ``offset``."""
+        start = offset + cue.start
+        return self._drawtext(
+            cue.text,
+            cue.fontsize,
+            f":enable='between(t,{start:.3f},{start + cue.duration:.3f})'"
+            f":alpha='{_cue_alpha_expr(cue, start)}'",
+        )
+
+    def _fit_audio(self, audio, duration: float):
+        """Trim or loop an audio clip so it lasts exactly ``duration`` seconds."""
+        if audio.duration > duration:
+            return audio.subclipped(0, duration)
+        if audio.duration < duration:
+            num_loops = int(duration / audio.duration) + 1
+            return concatenate_audioclips([audio] * num_loops).subclipped(0, duration)
+        return audio
+
+    def _fit_image(self, img: Image.Image) -> np.ndarray:
+        """Resize/crop a still once with Pillow (pillow-simd drops in for SIMD resampling)."""
+        img = img.convert("RGB")
+        if self.target_size and img.size != tuple(self.target_size):
+            tw, th = self.target_size
+            cw, ch = img.size
+            scale = max(tw / cw, th / ch)
+            # Resample only the centered source window: resize + crop in one pass,
+            # without materializing the oversized intermediate.
+            box_w, box_h = tw / scale, th / scale
+            left, top = (cw - box_w) / 2, (ch - box_h) / 2
+            img = img.resize((tw, th), Image.LANCZOS, box=(left, top, left + box_w, top + box_h))
+        return np.asarray(img)
+
+    def _load_image_clip(self, path: Path) -> ImageClip:
+        """ImageClip already fitted to the target size, so no per-frame resample is needed."""
+        with Image.open(path) as img:
+            return ImageClip(self._fit_image(img))
+
     def _fit_to_frame(self, clip):
         """Resize/crop to target size while preserving aspect ratio."""
         if not self.target_size or not hasattr(clip, "size") or not clip.size:
             return clip
+        # Already the right size (e.g. stills fitted on load): nothing to resample.
+        if tuple(clip.size) == tuple(self.target_size):
+            return clip
+        if isinstance(clip, ImageClip) and clip.mask is None:
+            fitted = ImageClip(self._fit_image(Image.fromarray(clip.img)))
+            return fitted.with_duration(clip.duration) if clip.duration else fitted
         tw, th = self.target_size
         try:
             cw, ch = clip.size
             if not cw or not ch:
                 return clip
             scale = max(tw / cw, th / ch)
-            resized = clip.resize(newsize=(int(cw * scale), int(ch * scale)))
+            resized = clip.resized(new_size=(int(cw * scale), int(ch * scale)))
             # Center crop to exact size.
-            cropped = resized.crop(
+            cropped = resized.cropped(
                 x_center=resized.w / 2,
                 y_center=resized.h / 2,
                 width=tw,
@@ -179,23 +557,46 @@ class VideoAssembler:
         except Exception:
             return clip
     
+    def _kenburns(self, clip, duration: float, zoom: float):
+        """Slow zoom-in. Stills use a few pre-resized frames instead of a per-frame resize."""
+        if not isinstance(clip, ImageClip):
+            # Keep the frame size fixed while the content zooms, so segments stay uniform.
+            zoomed = clip.resized(lambda t: 1 + (zoom * (t / duration)))
+            return CompositeVideoClip([zoomed.with_position("center")], size=clip.size)
+
+        source = Image.fromarray(clip.get_frame(0))
+        w, h = source.size
+        frames = []
+        for level in np.linspace(1.0, 1.0 + zoom, KENBURNS_LEVELS):
+            zw, zh = int(round(w * level)), int(round(h * level))
+            x0, y0 = (zw - w) // 2, (zh - h) // 2
+            zoomed = source.resize((zw, zh), Image.BILINEAR)
+            frames.append(np.asarray(zoomed.crop((x0, y0, x0 + w, y0 + h))))
+
+        last = KENBURNS_LEVELS - 1
+
+        def frame_at(t):
+            return frames[min(int(t / duration * last), last)]
+
+        return VideoClip(frame_function=frame_at, duration=duration)
+
     def _create_break_clip(self, scene: Scene, break_duration: float = 2.5) -> Optional[object]:
         """Create a break clip with scene title on Pixabay image with background audio."""
         try:
             # Load image for break
             image_clip = None
             if scene.image_path and Path(scene.image_path).exists():
-                image_clip = ImageClip(str(scene.image_path))
+                image_clip = self._load_image_clip(Path(scene.image_path))
             elif scene.video_path and Path(scene.video_path).exists():
                 try:
                     with VideoFileClip(str(scene.video_path)) as vid:
                         frame = vid.get_frame(0)
                         image_clip = ImageClip(frame)
                 except Exception as e:
-                    print(f"[Break] Failed to extract frame from video: {e}")
+                    logger.warning("[Break] Failed to extract frame from video: %s", e)
 
             if not image_clip:
-                print(f"[Break] Warning: No visual asset for break clip of scene '{scene.title}'")
+                logger.warning("[Break] No visual asset for break clip of scene '%s'", scene.title)
                 return None
             
             # Create image clip with break duration
@@ -212,7 +613,7 @@ class VideoAssembler:
                 dim_clip = ColorClip(size=(w, h), color=(0, 0, 0)).with_opacity(0.5).with_duration(break_duration)
                 image_clip = CompositeVideoClip([image_clip, dim_clip])
             except Exception as e:
-                print(f"[Break] Warning: Could not add dimming overlay: {e}")
+                logger.warning("[Break] Could not add dimming overlay: %s", e)
             
             # Create title text overlay with larger font for break
             title_fontsize = int(self._get_subtitle_fontsize() * 1.5)
@@ -229,107 +630,144 @@ class VideoAssembler:
                     title_clip = title_clip.with_effects([vfx.FadeIn(0.3), vfx.FadeOut(0.3)])
                     image_clip = CompositeVideoClip([image_clip, title_clip])
             except Exception as e:
-                print(f"[Break] Warning: Could not add title to break clip: {e}")
+                logger.warning("[Break] Could not add title to break clip: %s", e)
             
             # Add audio to break if available
             if hasattr(scene, 'break_audio_path') and scene.break_audio_path and Path(scene.break_audio_path).exists():
                 try:
-                    break_audio = AudioFileClip(str(scene.break_audio_path))
-                    # Trim or loop audio to match break duration
-                    if break_audio.duration > break_duration:
-                        break_audio = break_audio.subclipped(0, break_duration)
-                    elif break_audio.duration < break_duration:
-                        num_loops = int(break_duration / break_audio.duration) + 1
-                        break_audio = concatenate_audioclips([break_audio] * num_loops).subclipped(0, break_duration)
+                    break_audio = self._fit_audio(AudioFileClip(str(scene.break_audio_path)), break_duration)
                     # Reduce volume to 50% so it's subtle
                     break_audio = break_audio.with_effects([afx.MultiplyVolume(0.5)])
                     image_clip = image_clip.with_audio(break_audio)
                 except Exception as e:
-                    print(f"[Break] Warning: Could not add audio to break: {e}")
+                    logger.warning("[Break] Could not add audio to break: %s", e)
             
             return image_clip
         except Exception as e:
-            print(f"[Break] Error creating break clip for '{scene.title}': {e}")
+            logger.error("[Break] Error creating break clip for '%s': %s", scene.title, e)
             return None
     
-    def build(self, scenes: List[Scene], output_path: Path, include_breaks: bool = True) -> Path:
-        print(f"Building video at {output_path} with {len(scenes)} scenes")
-        print(f"[Assembler] Background music path provided: {self.background_music_path}")
-        clips = []
+    def _subtitle_box_width(self, visual_path: Path, is_video: bool) -> Optional[int]:
+        """Derive a width that keeps subtitles within frame bounds."""
+        try:
+            if self.target_size:
+                base_width = self.target_size[0]
+            elif is_video:
+                with VideoFileClip(str(visual_path)) as probe:
+                    base_width = probe.size[0] if probe.size else None
+            else:
+                with Image.open(visual_path) as img:
+                    base_width = img.size[0]
+            return int(base_width * 0.9) if base_width else None
+        except Exception:
+            return None
 
-        for idx, scene in enumerate(scenes):
-            if not scene.audio_path:
-                raise RuntimeError("Scene missing audio")
-            audio_clip = AudioFileClip(str(scene.audio_path))
-            duration = audio_clip.duration
+    def _hydrate_scene(self, desc: SceneDescriptor, fade_in: bool = True):
+        """Rebuild the MoviePy clip for a scene from its worker-produced descriptor."""
+        duration = desc.duration
+        audio_clip = AudioFileClip(str(desc.audio_path))
 
-            if scene.video_path and Path(scene.video_path).exists():
-                image_clip = VideoFileClip(str(scene.video_path)).with_duration(duration)
-            elif scene.image_path and Path(scene.image_path).exists():
-                image_clip = ImageClip(str(scene.image_path)).with_duration(duration)
-            else:
-                raise RuntimeError("Scene missing visual asset")
-            image_clip = self._fit_to_frame(image_clip)
-            if self.kenburns_zoom > 0:
-                image_clip = image_clip.resized(
-                    lambda t: 1 + (self.kenburns_zoom * (t / duration))
-                )
-            clip = image_clip.with_audio(audio_clip)
-            
-            # Mix in per-scene sound effects if available
-            if scene.sfx_path and Path(scene.sfx_path).exists():
-                try:
-                    sfx_audio = AudioFileClip(str(scene.sfx_path))
-                    # Trim or loop SFX to match scene duration
-                    if sfx_audio.duration > duration:
-                        # Trim to scene duration
-                        sfx_audio = sfx_audio.subclipped(0, duration)
-                    elif sfx_audio.duration < duration:
-                        # Loop the SFX to fill the scene duration
-                        num_loops = int(duration / sfx_audio.duration) + 1
-                        sfx_audio = concatenate_audioclips([sfx_audio] * num_loops).subclipped(0, duration)
-                    # Reduce SFX volume to 40% so it blends with narration
-                    sfx_audio = sfx_audio.with_effects([afx.MultiplyVolume(0.2)])
-                    # Composite narration + SFX
-                    scene_audio = CompositeAudioClip([audio_clip, sfx_audio])
-                    clip = clip.with_audio(scene_audio)
-                except Exception as e:
-                    print(f"Warning: Failed to add SFX to scene: {e}")
-            
-            if self.enable_subtitles and scene.subtitle:
-                # Derive a width that keeps subtitles within frame bounds.
-                clip_width = None
-                clip_width = None
+        if desc.is_video:
+            image_clip = VideoFileClip(str(desc.visual_path)).with_duration(duration)
+        else:
+            image_clip = self._load_image_clip(desc.visual_path).with_duration(duration)
+        image_clip = self._fit_to_frame(image_clip)
+        # Stock footage already has motion; Ken Burns would only add a per-frame resample.
+        if self.kenburns_zoom > 0 and not desc.is_video:
+            image_clip = self._kenburns(image_clip, duration, self.kenburns_zoom)
+        clip = image_clip.with_audio(audio_clip)
+
+        # Mix in per-scene sound effects if available
+        if desc.sfx_path:
+            try:
+                sfx_audio = self._fit_audio(AudioFileClip(str(desc.sfx_path)), duration)
+                # Reduce SFX volume to 40% so it blends with narration
+                sfx_audio = sfx_audio.with_effects([afx.MultiplyVolume(0.2)])
+                # Composite narration + SFX
+                scene_audio = CompositeAudioClip([audio_clip, sfx_audio])
+                clip = clip.with_audio(scene_audio)
+            except Exception as e:
+                logger.warning("Failed to add SFX to scene: %s", e)
+
+        if desc.overlays:
+            scaled: Dict = {}
+            overlay_clips = [self._overlay_clip(overlay, scaled) for overlay in desc.overlays]
+            # Segment ends are float sums and can overshoot the scene by a hair.
+            clip = CompositeVideoClip([clip, *overlay_clips]).with_duration(clip.duration)
+        if fade_in and desc.idx > 0 and self.crossfade_sec > 0:
+            clip = clip.with_effects([vfx.FadeIn(self.crossfade_sec)])
+        return clip
+
+    def _read_ahead(self, scenes: List[Scene], depth: int = READ_AHEAD_DEPTH) -> Iterator[SceneDescriptor]:
+        """Prepare upcoming scenes on a background thread while the caller composes the current one.
+
+        The bounded queue keeps at most ``depth`` prepared scenes in memory.
+        """
+        prepared: "queue.Queue[Tuple[Optional[SceneDescriptor], Optional[BaseException]]]" = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            while not stop.is_set():
                 try:
-                    base_width = (
-                        self.target_size[0]
-                        if self.target_size
-                        else (image_clip.size[0] if image_clip.size else None)
-                    )
-                    if base_width:
-                        clip_width = int(base_width * 0.9)
-                except Exception:
-                    clip_width = None
-
-                segments = self._subtitle_segments(scene.subtitle, duration)
-                overlays = []
-                for idx, seg in enumerate(segments):
-                    # Get interactive font size (varies by segment index)
-                    interactive_fontsize = self._get_interactive_fontsize(idx, len(segments))
-                    text_clip = self._create_text_clip(seg["text"], seg["duration"], clip_width, fontsize=interactive_fontsize)
-                    if text_clip:
-                        text_clip = text_clip.with_position(("center", "center"))
-                        
-                        # Apply different effects based on segment index for variety
-                        effect_type = idx % 4  # Cycle through 4 different effects
-                        text_clip = self._apply_subtitle_effect(text_clip, effect_type, seg["duration"])
-                        overlays.append(text_clip.with_start(seg["start"]))
-                if overlays:
-                    clip = CompositeVideoClip([clip, *overlays])
-            if idx > 0 and self.crossfade_sec > 0:
-                clip = clip.with_effects([vfx.FadeIn(self.crossfade_sec)])
+                    prepared.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for idx, scene in enumerate(scenes):
+                    if not put((_build_scene(scene, idx, self), None)):
+                        return
+            except BaseException as e:
+                put((None, e))
+
+        threading.Thread(target=produce, name="scene-read-ahead", daemon=True).start()
+        try:
+            for _ in scenes:
+                desc, error = prepared.get()
+                if error is not None:
+                    raise error
+                yield desc
+        finally:
+            stop.set()
+
+    def build(
+        self,
+        scenes: List[Scene],
+        output_path: Path,
+        include_breaks: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Path:
+        """Assemble scenes into a single video.
+
+        Per-scene preparation (media probing and subtitle rasterization) runs in
+        ``executor`` when one is given, e.g. a ``ProcessPoolExecutor`` created by the
+        caller; otherwise it runs inline. With ``segment_concat`` each scene is
+        encoded separately (in the executor too) and joined by ffmpeg.
+        """
+        logger.info("Building video at %s with %d scenes", output_path, len(scenes))
+        logger.info("[Assembler] Background music path provided: %s", self.background_music_path)
+        if self.segment_concat:
+            return self._build_from_segments(scenes, output_path, include_breaks, executor)
+        clips = []
+
+        if executor is not None:
+            descriptors = executor.map(_build_scene, scenes, range(len(scenes)), repeat(self))
+        else:
+            descriptors = self._read_ahead(scenes)
+
+        # drawtext subtitles are timed on the output timeline; clips overlap by the crossfade.
+        filters: List[str] = []
+        offset = 0.0
+        overlap = max(0.0, self.crossfade_sec)
+        for idx, desc in enumerate(descriptors):
+            clip = self._hydrate_scene(desc)
+            filters.extend(self._cue_filter(cue, offset) for cue in desc.cues)
+            offset += clip.duration - overlap
             clips.append(clip)
-            
+
             # Add break clip after each scene (except the last one)
             if include_breaks and idx < len(scenes) - 1:
                 # Use the NEXT scene for the break clip (Chapter Intro)
@@ -337,57 +775,120 @@ class VideoAssembler:
                 break_clip = self._create_break_clip(next_scene, break_duration=2.5)
                 if break_clip:
                     clips.append(break_clip)
+                    offset += break_clip.duration - overlap
 
         padding = -self.crossfade_sec if self.crossfade_sec > 0 else 0
         final = concatenate_videoclips(clips, method="compose", padding=padding)
         
         # Mix background music if provided
+        bg_track = None
         if self.background_music_path and self.background_music_path.exists():
             try:
-                print(f"[Background Music] Loading from: {self.background_music_path}")
-                bg_audio = AudioFileClip(str(self.background_music_path))
-                print(f"[Background Music] Duration: {bg_audio.duration}s, Video duration: {final.duration}s")
-                
-                # Get the final video duration
                 video_duration = final.duration
-                # Loop background music if needed to match video duration
-                if bg_audio.duration < video_duration:
-                    num_loops = int(video_duration / bg_audio.duration) + 1
-                    print(f"[Background Music] Looping {num_loops} times to cover video duration")
-                    bg_audio = concatenate_audioclips([bg_audio] * num_loops)
-                
-                # Trim to exact video duration
-                bg_audio = bg_audio.subclipped(0, video_duration)
-                print(f"[Background Music] Trimmed to {bg_audio.duration}s")
-
-                # Mix background audio at lower volume (20%) with main audio
-                bg_audio = bg_audio.with_effects([afx.MultiplyVolume(0.2)])
-                print(f"[Background Music] Volume reduced to 20%")
+                logger.info("[Background Music] Looping %s to %.2fs with ffmpeg", self.background_music_path, video_duration)
+                # ffmpeg loops, trims and attenuates (20%) in one decode instead of N MoviePy copies.
+                bg_track = loop_audio(
+                    self.background_music_path,
+                    output_path.with_suffix(".bg-audio.m4a"),
+                    video_duration,
+                    volume=0.2,
+                )
+                bg_audio = AudioFileClip(str(bg_track))
 
                 main_audio = final.audio
                 if main_audio:
-                    print(f"[Background Music] Compositing with main audio track")
+                    logger.info("[Background Music] Compositing with main audio track")
                     # Composite the audio tracks
                     final_audio = CompositeAudioClip([main_audio, bg_audio])
                     final = final.with_audio(final_audio)
-                    print(f"[Background Music] Successfully mixed background music")
+                    logger.info("[Background Music] Successfully mixed background music")
                 else:
-                    print(f"[Background Music] Warning: No main audio track found")
+                    logger.warning("[Background Music] No main audio track found")
             except Exception as e:
-                print(f"Warning: Failed to add background music: {e}")
+                logger.warning("Failed to add background music: %s", e)
         else:
-            print(f"[Background Music] No background music path provided or file not found")
-        
+            logger.info("[Background Music] No background music path provided or file not found")
+
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        final.write_videofile(
-            str(output_path),
-            fps=self.fps,
-            codec="libx264",
-            audio_codec="aac",
-            bitrate="8000k",
-            threads=4,
-            temp_audiofile=str(output_path.with_suffix(".temp-audio.m4a")),
-            remove_temp=True,
-            preset="slow",
-        )
+        try:
+            self._write_clip(final, output_path, filters)
+        finally:
+            if bg_track:
+                bg_track.unlink(missing_ok=True)
         return output_path
+
+    def _can_copy_audio(self, desc: SceneDescriptor) -> bool:
+        """Whether a scene's narration can be stream-copied into its segment as-is."""
+        # gTTS and Polly write MP3, so only probe files that can hold AAC at all.
+        if desc.sfx_path or desc.audio_path.suffix.lower() not in AAC_SUFFIXES:
+            return False
+        info = probe_audio(desc.audio_path)
+        return bool(info) and info[0] == "aac" and info[1] >= COPY_AUDIO_MIN_BITRATE
+
+    def _write_clip(self, clip, output_path: Path, video_filters: Sequence[str] = ()) -> None:
+        temp_audio = None
+        if clip.audio is not None:
+            temp_audio = output_path.with_suffix(".temp-audio.m4a")
+            clip.audio.write_audiofile(str(temp_audio), fps=44100, codec="aac", logger=None)
+        try:
+            encode_frames(
+                clip.iter_frames(fps=self.fps, dtype="uint8"),
+                clip.size,
+                self.fps,
+                output_path,
+                audio=temp_audio,
+                video_filters=video_filters,
+            )
+        finally:
+            if temp_audio:
+                temp_audio.unlink(missing_ok=True)
+
+    def _build_from_segments(
+        self,
+        scenes: List[Scene],
+        output_path: Path,
+        include_breaks: bool,
+        executor: Optional[Executor],
+    ) -> Path:
+        """Encode each scene/break to its own file, then join them with ffmpeg."""
+        with tempfile.TemporaryDirectory(prefix="video-segments-", dir=scratch_root()) as tmp:
+            tmp_dir = Path(tmp)
+            jobs = []
+            for idx, scene in enumerate(scenes):
+                jobs.append((_render_scene_segment, (scene, idx, self, tmp_dir / f"scene_{idx}.mp4")))
+                # Add break clip after each scene (except the last one), titled with the NEXT scene
+                if include_breaks and idx < len(scenes) - 1:
+                    jobs.append((_render_break_segment, (scenes[idx + 1], self, tmp_dir / f"break_{idx}.mp4")))
+
+            if executor is not None:
+                futures = [executor.submit(fn, *args) for fn, args in jobs]
+                results = [future.result() for future in futures]
+            else:
+                results = [fn(*args) for fn, args in jobs]
+            segments = [result for result in results if result]
+
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            self._join_segments(segments, output_path, tmp_dir)
+        return output_path
+
+    def _join_segments(self, segments: List[Tuple[Path, float]], output_path: Path, tmp_dir: Path) -> None:
+        graph = FilterGraph()
+        if self.crossfade_sec > 0 and len(segments) > 1:
+            # xfade needs decoded frames, so the video is re-encoded once here.
+            pads = []
+            for path, duration in segments:
+                idx = graph.add_input("-i", str(path))
+                graph.add(f"[{idx}:a]aresample=44100,aformat=channel_layouts=stereo[sa{idx}]")
+                pads.append((f"[{idx}:v]", f"[sa{idx}]", duration))
+            video, audio = graph.join(pads, self.crossfade_sec)
+            audio = graph.mix_background(audio, self.background_music_path)
+            video_args = ["-map", video, *video_encoder_args(self.fps)]
+        else:
+            # Same encoder settings everywhere, so the video stream is copied as-is.
+            concat_list = write_concat_list([path for path, _ in segments], tmp_dir / "concat.txt")
+            source = graph.add_input("-f", "concat", "-safe", "0", "-i", str(concat_list))
+            graph.add(f"[{source}:a]aresample=44100,aformat=channel_layouts=stereo[joined]")
+            audio = graph.mix_background("[joined]", self.background_music_path)
+            video_args = ["-map", f"{source}:v", "-c:v", "copy"]
+
+        run_ffmpeg([*graph.args(), *video_args, "-map", audio, "-c:a", "aac", str(output_path)])
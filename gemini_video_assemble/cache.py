@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Mapping, Optional
+from urllib.parse import urlencode
+
+
+# Default lifetime of cached provider search responses, in seconds.
+SEARCH_TTL_SEC = 86400
+# Seconds between full scans of the blob directory; in between, new blobs are tallied in memory.
+EVICT_SWEEP_SEC = 300
+
+
+def request_key(url: str, params: Mapping | None = None) -> str:
+    """Stable key for a GET request: the URL plus its sorted query parameters."""
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Hardlink ``src`` to the absent path ``dest``, copying when linking is not possible.
+
+    Every writer in the package replaces files through a rename, so a linked
+    file is never modified in place underneath the other name.
+    """
+    try:
+        os.link(src, dest)
+    except OSError:
+        # Different filesystems (e.g. tmpfs scratch), or no hardlink support.
+        shutil.copyfile(src, dest)
+
+
+class DiskCache:
+    """Search responses and downloaded media kept on disk across renders.
+
+    JSON lives under ``http/`` and downloaded files under ``blobs/``, both named
+    by key. Entries are written to a temporary file and renamed into place, so
+    concurrent scenes fetching the same asset never read a partial entry.
+    Blobs are hardlinked in and out where the filesystem allows; with
+    ``max_bytes`` the least recently used blobs are evicted past that size.
+    The directory is only scanned when the running total crosses the limit,
+    or every ``EVICT_SWEEP_SEC`` to pick up blobs other processes stored.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 0):
+        self.root = Path(root)
+        self.json_dir = self.root / "http"
+        self.blob_dir = self.root / "blobs"
+        self.max_bytes = max_bytes
+        self._blob_lock = threading.Lock()
+        self._blob_bytes = 0
+        self._swept_at = float("-inf")
+        self.json_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+    def _publish(self, src: Path, dest: Path) -> None:
+        tmp = dest.with_name(f".tmp-{os.getpid()}-{threading.get_ident()}-{dest.name}")
+        try:
+            tmp.unlink(missing_ok=True)
+            _link_or_copy(src, tmp)
+            os.replace(tmp, dest)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _account(self, size: int) -> None:
+        """Add a stored blob to the running total, sweeping once it is over budget or stale."""
+        if self.max_bytes <= 0:
+            return
+        with self._blob_lock:
+            self._blob_bytes += size
+            now = time.monotonic()
+            if self._blob_bytes <= self.max_bytes and now - self._swept_at < EVICT_SWEEP_SEC:
+                return
+            self._swept_at = now
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used blobs until the total fits ``max_bytes``."""
+        entries = []
+        for entry in os.scandir(self.blob_dir):
+            if entry.name.startswith(".tmp-"):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+        with self._blob_lock:
+            self._blob_bytes = total
+
+    def json(self, key: str, fetcher: Callable[[], dict], ttl: Optional[float] = None) -> dict:
+        """Cached JSON for ``key``, calling ``fetcher`` and storing its result on a miss.
+
+        With ``ttl`` (seconds), entries older than that count as a miss.
+        """
+        path = self.json_dir / f"{key}.json"
+        try:
+            if ttl is None or time.time() - path.stat().st_mtime < ttl:
+                return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        data = fetcher()
+        fd, tmp = tempfile.mkstemp(dir=self.json_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(data, fh)
+            os.replace(tmp, path)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+        return data
+
+    def blob(self, url: str, dest: Path, downloader: Callable[[Path], Path]) -> Path:
+        """Link or copy the cached download of ``url`` to ``dest``, downloading it on a miss."""
+        path = self.blob_dir / request_key(url)
+        if path.exists():
+            try:
+                # Mark the entry used; atime alone is unreliable on relatime/noatime mounts.
+                os.utime(path)
+                dest.unlink(missing_ok=True)
+                _link_or_copy(path, dest)
+                return dest
+            except FileNotFoundError:
+                pass  # Evicted between the check and the link; download it again.
+        downloader(dest)
+        self._publish(dest, path)
+        self._account(dest.stat().st_size)
+        return dest
+
+    def clear(self) -> None:
+        """Drop every cached response and download."""
+        for directory in (self.json_dir, self.blob_dir):
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir(parents=True, exist_ok=True)
+        with self._blob_lock:
+            self._blob_bytes = 0
@@ -10,7 +10,7 @@ try:
 except ImportError:
     BaseApplication = None
 
-from .config import Settings
+from .config import get_settings
 from .config_store import ConfigStore
 from .server import create_app
 from .storage import DataStore
@@ -54,6 +54,17 @@ def main(argv: Optional[list[str]] = None) -> None:
         dest="db_path",
         help="Path to SQLite cache/db (defaults to ~/.gemini_video_assemble/data.db).",
     )
+    parser.add_argument(
+        "--workers", type=int, default=2, help="Gunicorn worker processes (default: 2)."
+    )
+    parser.add_argument(
+        "--worker-class",
+        default="gthread",
+        help="Gunicorn worker class, e.g. gthread or gevent (default: gthread).",
+    )
+    parser.add_argument(
+        "--threads", type=int, default=4, help="Threads per gthread worker (default: 4)."
+    )
     parser.add_argument(
         "--purge-data",
         action="store_true",
@@ -62,7 +73,7 @@ def main(argv: Optional[list[str]] = None) -> None:
     args = parser.parse_args(argv)
 
     config_store = ConfigStore(args.config_path)
-    settings = Settings.from_sources(config_store.load())
+    settings = get_settings(config_store.load())
     data_store = DataStore(args.db_path)
 
     if args.purge_data:
@@ -83,9 +94,11 @@ def main(argv: Optional[list[str]] = None) -> None:
         print(f"Starting Gunicorn server on {args.host}:{port}...")
         options = {
             "bind": f"{args.host}:{port}",
-            "workers": 2,
-            "threads": 4,
-            "worker_class": "gthread",
+            "workers": args.workers,
+            "threads": args.threads,
+            "worker_class": args.worker_class,
+            # Concurrent connections per gevent/eventlet worker; ignored by gthread.
+            "worker_connections": 64,
             "accesslog": "-",
             "errorlog": "-",
             "timeout": 120,  # Longer timeout for video generation
@@ -1,7 +1,28 @@
 import os
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Mapping, Optional
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+
+# Keys whose values are masked wherever configuration is displayed.
+SECRET_KEYS = (
+    "GOOGLE_API_KEY",
+    "PIXABAY_KEY",
+    "FREESOUND_KEY",
+    "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY",
+)
+
+
+def mask_secret_values(values: Mapping[str, object]) -> Dict[str, object]:
+    """Copy of ``values`` with secrets cut to their first four characters."""
+    masked = dict(values)
+    for key in SECRET_KEYS:
+        value = masked.get(key)
+        if value:
+            masked[key] = f"{str(value)[:4]}***"
+    return masked
 
 
 def _bool_from_env(value: str | None, default: bool) -> bool:
@@ -10,7 +31,61 @@ def _bool_from_env(value: str | None, default: bool) -> bool:
     return str(value).lower() not in {"0", "false", "no", "off", ""}
 
 
-@dataclass
+def _resolved_path(value: str) -> Path:
+    return Path(value).resolve()
+
+
+# Settings field -> (environment/config key, parser for the raw string value).
+_ENV_SPEC: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "google_api_key": ("GOOGLE_API_KEY", str),
+    "gemini_text_model": ("GEMINI_TEXT_MODEL", str),
+    "gemini_image_model": ("GEMINI_IMAGE_MODEL", str),
+    "tts_provider": ("TTS_PROVIDER", str),
+    "tts_lang": ("TTS_LANG", str),
+    "tts_voice": ("TTS_VOICE", str),
+    "aws_access_key_id": ("AWS_ACCESS_KEY_ID", str),
+    "aws_secret_access_key": ("AWS_SECRET_ACCESS_KEY", str),
+    "aws_region": ("AWS_REGION", str),
+    "polly_voice_id": ("POLLY_VOICE_ID", str),
+    "polly_engine": ("POLLY_ENGINE", str),
+    "s3_bucket_name": ("S3_BUCKET_NAME", str),
+    "s3_prefix": ("S3_PREFIX", str),
+    "pixabay_key": ("PIXABAY_KEY", str),
+    "freesound_key": ("FREESOUND_KEY", str),
+    "pixabay_max_concurrency": ("PIXABAY_MAX_CONCURRENCY", int),
+    "freesound_max_concurrency": ("FREESOUND_MAX_CONCURRENCY", int),
+    "output_dir": ("OUTPUT_DIR", _resolved_path),
+    "cache_dir": ("CACHE_DIR", _resolved_path),
+    "media_cache_bytes": ("MEDIA_CACHE_BYTES", int),
+    "search_cache_ttl": ("SEARCH_CACHE_TTL", int),
+    "enable_plan_cache": ("ENABLE_PLAN_CACHE", lambda value: _bool_from_env(value, default=True)),
+    "plan_cache_ttl": ("PLAN_CACHE_TTL", int),
+    "crossfade_sec": ("CROSSFADE_SEC", float),
+    "kenburns_zoom": ("KENBURNS_ZOOM", float),
+    "enable_subtitles": ("SUBTITLES_ENABLED", lambda value: _bool_from_env(value, default=True)),
+    "subtitle_font": ("SUBTITLE_FONT", str),
+    "subtitle_fontsize": ("SUBTITLE_FONTSIZE", int),
+    "subtitle_color": ("SUBTITLE_COLOR", str),
+    "subtitle_stroke_color": ("SUBTITLE_STROKE_COLOR", str),
+    "subtitle_stroke_width": ("SUBTITLE_STROKE_WIDTH", int),
+    "subtitle_renderer": ("SUBTITLE_RENDERER", str),
+    "assembler_workers": ("ASSEMBLER_WORKERS", int),
+    "assembler_backend": ("ASSEMBLER_BACKEND", str),
+    "render_workers": ("RENDER_WORKERS", int),
+    "image_style": ("IMAGE_STYLE", str),
+    "default_aspect": ("VIDEO_ASPECT", str),
+    "download_accel_prefix": ("DOWNLOAD_ACCEL_PREFIX", str),
+    "port": ("PORT", int),
+}
+
+# Size fields are split into separate width/height keys.
+_SIZE_SPEC: Dict[str, Tuple[str, str]] = {
+    "horizontal_size": ("HORIZONTAL_WIDTH", "HORIZONTAL_HEIGHT"),
+    "vertical_size": ("VERTICAL_WIDTH", "VERTICAL_HEIGHT"),
+}
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     google_api_key: Optional[str] = None
     gemini_text_model: str = "gemini-1.5-flash-latest"
@@ -27,7 +102,14 @@ class Settings:
     s3_prefix: str = "videos"
     pixabay_key: Optional[str] = None
     freesound_key: Optional[str] = None
+    pixabay_max_concurrency: int = 4
+    freesound_max_concurrency: int = 4
     output_dir: Path = field(default_factory=lambda: Path("renders").resolve())
+    cache_dir: Path = field(default_factory=lambda: Path(".cache").resolve())
+    media_cache_bytes: int = 2 * 1024**3
+    search_cache_ttl: int = 86400
+    enable_plan_cache: bool = True
+    plan_cache_ttl: int = 86400
     crossfade_sec: float = 0.6
     kenburns_zoom: float = 0.04
     enable_subtitles: bool = True
@@ -36,66 +118,44 @@ class Settings:
     subtitle_color: str = "white"
     subtitle_stroke_color: str = "black"
     subtitle_stroke_width: int = 1
+    subtitle_renderer: str = "bitmap"
+    assembler_workers: int = 0
+    assembler_backend: str = "moviepy"
+    render_workers: int = 1
     image_style: str = (
         "cinematic, cohesive color palette, volumetric light, ultra detailed, 16:9"
     )
     default_aspect: str = "horizontal"
     horizontal_size: tuple[int, int] = (1920, 1080)
     vertical_size: tuple[int, int] = (1080, 1920)
+    download_accel_prefix: Optional[str] = None
     port: int = 5000
 
     @classmethod
-    def from_sources(cls, overrides: Optional[Mapping[str, str]] = None) -> "Settings":
+    def from_sources(
+        cls, overrides: Optional[Mapping[str, str]] = None, env: Optional[Mapping[str, str]] = None
+    ) -> "Settings":
         overrides = overrides or {}
+        # One snapshot, so every value is read from the same environment.
+        env = dict(env) if env is not None else os.environ.copy()
+
+        def pick(name: str) -> str | None:
+            return overrides.get(name) or env.get(name)
+
+        values = {}
+        for field_name, (var, parse) in _ENV_SPEC.items():
+            raw = pick(var)
+            if raw is not None:
+                values[field_name] = parse(raw)
+        # Slotted dataclasses keep defaults on the fields, not as class attributes.
+        defaults = {f.name: f.default for f in fields(cls) if f.default is not MISSING}
+        for field_name, (width_var, height_var) in _SIZE_SPEC.items():
+            width, height = defaults[field_name]
+            values[field_name] = (int(pick(width_var) or width), int(pick(height_var) or height))
+        return cls(**values)
 
-        def pick(name: str, default: str | None = None) -> str | None:
-            return overrides.get(name) or os.getenv(name, default)
-
-        settings = cls(
-            google_api_key=pick("GOOGLE_API_KEY"),
-            gemini_text_model=pick("GEMINI_TEXT_MODEL", cls.gemini_text_model),
-            gemini_image_model=pick("GEMINI_IMAGE_MODEL", cls.gemini_image_model),
-            tts_provider=pick("TTS_PROVIDER", cls.tts_provider),
-            tts_lang=pick("TTS_LANG", cls.tts_lang),
-            tts_voice=pick("TTS_VOICE", cls.tts_voice),
-            aws_access_key_id=pick("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=pick("AWS_SECRET_ACCESS_KEY"),
-            aws_region=pick("AWS_REGION", cls.aws_region),
-            polly_voice_id=pick("POLLY_VOICE_ID", cls.polly_voice_id),
-            polly_engine=pick("POLLY_ENGINE", cls.polly_engine),
-            s3_bucket_name=pick("S3_BUCKET_NAME"),
-            s3_prefix=pick("S3_PREFIX", cls.s3_prefix),
-            pixabay_key=pick("PIXABAY_KEY"),
-            freesound_key=pick("FREESOUND_KEY"),
-            output_dir=Path(pick("OUTPUT_DIR", "renders")).resolve(),
-            crossfade_sec=float(pick("CROSSFADE_SEC", str(cls.crossfade_sec))),
-            kenburns_zoom=float(pick("KENBURNS_ZOOM", str(cls.kenburns_zoom))),
-            enable_subtitles=_bool_from_env(
-                pick("SUBTITLES_ENABLED", "1" if cls.enable_subtitles else "0"),
-                default=cls.enable_subtitles,
-            ),
-            subtitle_font=pick("SUBTITLE_FONT", cls.subtitle_font),
-            subtitle_fontsize=int(pick("SUBTITLE_FONTSIZE", str(cls.subtitle_fontsize))),
-            subtitle_color=pick("SUBTITLE_COLOR", cls.subtitle_color),
-            subtitle_stroke_color=pick("SUBTITLE_STROKE_COLOR", cls.subtitle_stroke_color),
-            subtitle_stroke_width=int(
-                pick("SUBTITLE_STROKE_WIDTH", str(cls.subtitle_stroke_width))
-            ),
-            image_style=pick("IMAGE_STYLE", cls.image_style),
-            default_aspect=pick("VIDEO_ASPECT", cls.default_aspect),
-            horizontal_size=(
-                int(pick("HORIZONTAL_WIDTH", str(cls.horizontal_size[0]))),
-                int(pick("HORIZONTAL_HEIGHT", str(cls.horizontal_size[1]))),
-            ),
-            vertical_size=(
-                int(pick("VERTICAL_WIDTH", str(cls.vertical_size[0]))),
-                int(pick("VERTICAL_HEIGHT", str(cls.vertical_size[1]))),
-            ),
-            port=int(pick("PORT", str(cls.port))),
-        )
-
-        settings.output_dir.mkdir(parents=True, exist_ok=True)
-        return settings
+    def ensure_dirs(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def to_public_dict(self, mask_secrets: bool = True) -> Dict[str, str]:
         data = {
@@ -114,6 +174,8 @@ class Settings:
             "S3_PREFIX": self.s3_prefix,
             "PIXABAY_KEY": self.pixabay_key,
             "FREESOUND_KEY": self.freesound_key,
+            "PIXABAY_MAX_CONCURRENCY": self.pixabay_max_concurrency,
+            "FREESOUND_MAX_CONCURRENCY": self.freesound_max_concurrency,
             "CROSSFADE_SEC": self.crossfade_sec,
             "KENBURNS_ZOOM": self.kenburns_zoom,
             "SUBTITLES_ENABLED": self.enable_subtitles,
@@ -122,6 +184,10 @@ class Settings:
             "SUBTITLE_COLOR": self.subtitle_color,
             "SUBTITLE_STROKE_COLOR": self.subtitle_stroke_color,
             "SUBTITLE_STROKE_WIDTH": self.subtitle_stroke_width,
+            "SUBTITLE_RENDERER": self.subtitle_renderer,
+            "ASSEMBLER_WORKERS": self.assembler_workers,
+            "ASSEMBLER_BACKEND": self.assembler_backend,
+            "RENDER_WORKERS": self.render_workers,
             "IMAGE_STYLE": self.image_style,
             "VIDEO_ASPECT": self.default_aspect,
             "HORIZONTAL_WIDTH": self.horizontal_size[0],
@@ -129,17 +195,46 @@ class Settings:
             "VERTICAL_WIDTH": self.vertical_size[0],
             "VERTICAL_HEIGHT": self.vertical_size[1],
             "OUTPUT_DIR": str(self.output_dir),
+            "DOWNLOAD_ACCEL_PREFIX": self.download_accel_prefix,
+            "CACHE_DIR": str(self.cache_dir),
+            "MEDIA_CACHE_BYTES": self.media_cache_bytes,
+            "SEARCH_CACHE_TTL": self.search_cache_ttl,
+            "ENABLE_PLAN_CACHE": self.enable_plan_cache,
+            "PLAN_CACHE_TTL": self.plan_cache_ttl,
         }
 
-        if mask_secrets:
-            for key in ("GOOGLE_API_KEY", "PIXABAY_KEY", "FREESOUND_KEY", "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY"):
-                value = data.get(key)
-                if value:
-                    data[key] = f"{str(value)[:4]}***"
-        return data
+        return mask_secret_values(data) if mask_secrets else data
+
+    @classmethod
+    def config_keys(cls) -> frozenset:
+        """Every key that can be set through the environment or the config store."""
+        return frozenset(cls().to_public_dict(mask_secrets=False))
 
     def require_core_keys(self) -> None:
         if not self.google_api_key:
             raise RuntimeError(
                 "GOOGLE_API_KEY is required. Set it via environment variables or the config UI."
             )
+
+
+# Every environment variable Settings reads; their values are part of the cache key.
+_ENV_VARS = tuple(
+    sorted({var for var, _ in _ENV_SPEC.values()} | {var for pair in _SIZE_SPEC.values() for var in pair})
+)
+
+
+@lru_cache(maxsize=8)
+def _settings_for(overrides: tuple, env: tuple) -> Settings:
+    return Settings.from_sources(dict(overrides), env=dict(env))
+
+
+def get_settings(overrides: Optional[Mapping[str, str]] = None) -> Settings:
+    """Settings for ``overrides`` and the environment, built once per distinct combination.
+
+    Override values are coerced to strings, as if they came from the environment,
+    so JSON values such as numbers or lists from the config API stay hashable.
+    """
+    items = tuple(sorted((k, str(v)) for k, v in (overrides or {}).items() if v is not None))
+    env = tuple((var, os.environ[var]) for var in _ENV_VARS if var in os.environ)
+    return _settings_for(items, env)
+
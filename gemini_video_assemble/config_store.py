@@ -3,44 +3,14 @@ import os
 from pathlib import Path
 from typing import Dict, Iterable, Mapping
 
+from .config import Settings
 from .storage import DataStore, default_data_dir
 
 
 class ConfigStore:
     """Config persistence backed by SQLite; reads legacy JSON on first load for migration."""
 
-    DEFAULT_KEYS = {
-        "GOOGLE_API_KEY",
-        "GEMINI_TEXT_MODEL",
-        "GEMINI_IMAGE_MODEL",
-        "TTS_PROVIDER",
-        "TTS_LANG",
-        "TTS_VOICE",
-        "AWS_ACCESS_KEY_ID",
-        "AWS_SECRET_ACCESS_KEY",
-        "AWS_REGION",
-        "POLLY_VOICE_ID",
-        "POLLY_ENGINE",
-        "S3_BUCKET_NAME",
-        "S3_PREFIX",
-        "PIXABAY_KEY",
-        "FREESOUND_KEY",
-        "CROSSFADE_SEC",
-        "KENBURNS_ZOOM",
-        "SUBTITLES_ENABLED",
-        "SUBTITLE_FONT",
-        "SUBTITLE_FONTSIZE",
-        "SUBTITLE_COLOR",
-        "SUBTITLE_STROKE_COLOR",
-        "SUBTITLE_STROKE_WIDTH",
-        "IMAGE_STYLE",
-        "VIDEO_ASPECT",
-        "HORIZONTAL_WIDTH",
-        "HORIZONTAL_HEIGHT",
-        "VERTICAL_WIDTH",
-        "VERTICAL_HEIGHT",
-        "OUTPUT_DIR",
-    }
+    DEFAULT_KEYS = Settings.config_keys()
 
     def __init__(
         self,
@@ -0,0 +1,159 @@
+import logging
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from .assembler import VideoAssembler
+from .ffmpeg_tools import (
+    FilterGraph,
+    Segment,
+    audio_duration,
+    run_ffmpeg,
+    video_encoder_args,
+)
+from .models import Scene
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegAssembler(VideoAssembler):
+    """
+    Assembles the video as one ffmpeg filter graph instead of MoviePy compositing.
+
+    Ken Burns becomes a zoompan filter, subtitles become drawtext nodes and scene
+    transitions become xfade/acrossfade, so no Python code runs per frame.
+    """
+
+    def _resolve_font(self):
+        # drawtext resolves fonts through fontconfig; no MoviePy probe needed.
+        return None
+
+    def _frame_filters(self, width: int, height: int, duration: float, kenburns: bool = True) -> str:
+        chain = (
+            f"scale={width}:{height}:force_original_aspect_ratio=increase,"
+            f"crop={width}:{height},setsar=1,fps={self.fps}"
+        )
+        if kenburns and self.kenburns_zoom > 0:
+            frames = max(1, int(duration * self.fps))
+            chain += (
+                f",zoompan=z='1+{self.kenburns_zoom}*on/{frames}'"
+                f":x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+                f":d=1:s={width}x{height}:fps={self.fps}"
+            )
+        return chain + ",format=yuv420p"
+
+    def _audio_filters(self, duration: float) -> str:
+        return (
+            "aresample=44100,aformat=sample_fmts=fltp:channel_layouts=stereo,"
+            f"apad,atrim=0:{duration:.3f},asetpts=PTS-STARTPTS"
+        )
+
+    def _add_visual_input(self, graph: FilterGraph, scene: Scene, duration: float) -> Optional[int]:
+        if scene.video_path and Path(scene.video_path).exists():
+            return graph.add_input("-stream_loop", "-1", "-t", f"{duration:.3f}", "-i", str(scene.video_path))
+        if scene.image_path and Path(scene.image_path).exists():
+            return graph.add_input(
+                "-loop", "1", "-framerate", str(self.fps), "-t", f"{duration:.3f}", "-i", str(scene.image_path)
+            )
+        return None
+
+    def _add_scene(self, graph: FilterGraph, scene: Scene, idx: int, size: Tuple[int, int]) -> Segment:
+        if not scene.audio_path:
+            raise RuntimeError("Scene missing audio")
+        width, height = size
+        duration = audio_duration(scene.audio_path)
+        visual = self._add_visual_input(graph, scene, duration)
+        if visual is None:
+            raise RuntimeError("Scene missing visual asset")
+        narration = graph.add_input("-i", str(scene.audio_path))
+
+        # Stock footage already moves; skip the zoompan pass for it.
+        frame_filters = self._frame_filters(width, height, duration, kenburns=not scene.has_video)
+        video_chain = f"[{visual}:v]{frame_filters}"
+        if self.enable_subtitles and scene.subtitle:
+            for cue in self._subtitle_cues(scene.subtitle, duration):
+                video_chain += "," + self._cue_filter(cue)
+        graph.add(f"{video_chain}[v{idx}]")
+
+        audio_chain = f"[{narration}:a]{self._audio_filters(duration)}"
+        if scene.sfx_path and Path(scene.sfx_path).exists():
+            sfx = graph.add_input("-stream_loop", "-1", "-i", str(scene.sfx_path))
+            graph.add(f"[{sfx}:a]volume=0.2,{self._audio_filters(duration)}[sfx{idx}]")
+            graph.add(f"{audio_chain}[nar{idx}]")
+            graph.add(f"[nar{idx}][sfx{idx}]amix=inputs=2:duration=first:normalize=0[a{idx}]")
+        else:
+            graph.add(f"{audio_chain}[a{idx}]")
+        return f"[v{idx}]", f"[a{idx}]", duration
+
+    def _add_break(
+        self, graph: FilterGraph, scene: Scene, idx: int, size: Tuple[int, int], duration: float = 2.5
+    ) -> Optional[Segment]:
+        width, height = size
+        visual = self._add_visual_input(graph, scene, duration)
+        if visual is None:
+            logger.warning("[Break] No visual asset for break clip of scene '%s'", scene.title)
+            return None
+
+        fade = 0.3
+        title = self._drawtext(
+            scene.title,
+            int(self._get_subtitle_fontsize() * 1.5),
+            f":alpha='if(lt(t,{fade}),t/{fade},if(gt(t,{duration - fade:.3f}),({duration:.3f}-t)/{fade},1))'",
+        )
+        graph.add(
+            f"[{visual}:v]{self._frame_filters(width, height, duration)},"
+            f"drawbox=x=0:y=0:w=iw:h=ih:color=black@0.5:t=fill,{title}[bv{idx}]"
+        )
+
+        if scene.break_audio_path and Path(scene.break_audio_path).exists():
+            audio = graph.add_input("-stream_loop", "-1", "-i", str(scene.break_audio_path))
+            graph.add(f"[{audio}:a]volume=0.5,{self._audio_filters(duration)}[ba{idx}]")
+        else:
+            audio = graph.add_input(
+                "-f", "lavfi", "-t", f"{duration:.3f}", "-i", "anullsrc=r=44100:cl=stereo"
+            )
+            graph.add(f"[{audio}:a]{self._audio_filters(duration)}[ba{idx}]")
+        return f"[bv{idx}]", f"[ba{idx}]", duration
+
+    def build(
+        self,
+        scenes: List[Scene],
+        output_path: Path,
+        include_breaks: bool = True,
+        executor: Optional[Executor] = None,
+    ) -> Path:
+        logger.info("[FFmpeg] Building video at %s with %d scenes", output_path, len(scenes))
+        size = self.target_size or (1920, 1080)
+        graph = FilterGraph()
+        segments: List[Segment] = []
+
+        for idx, scene in enumerate(scenes):
+            segments.append(self._add_scene(graph, scene, idx, size))
+            if include_breaks and idx < len(scenes) - 1:
+                break_segment = self._add_break(graph, scenes[idx + 1], idx, size)
+                if break_segment:
+                    segments.append(break_segment)
+
+        video, audio = graph.join(segments, self.crossfade_sec)
+
+        if self.background_music_path and self.background_music_path.exists():
+            logger.info("[Background Music] Mixing %s at 20%% volume", self.background_music_path)
+            audio = graph.mix_background(audio, self.background_music_path)
+        else:
+            logger.info("[Background Music] No background music path provided or file not found")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        run_ffmpeg(
+            [
+                *graph.args(),
+                "-map",
+                video,
+                "-map",
+                audio,
+                *video_encoder_args(self.fps),
+                "-c:a",
+                "aac",
+                str(output_path),
+            ]
+        )
+        return output_path
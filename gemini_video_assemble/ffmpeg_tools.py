@@ -0,0 +1,321 @@
+import json
+import logging
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+try:
+    import mutagen
+except ImportError:
+    mutagen = None
+
+logger = logging.getLogger(__name__)
+
+# Containers libsndfile reads; everything else (mp3, m4a, ...) goes through mutagen.
+SOUNDFILE_SUFFIXES = {".wav", ".flac", ".ogg"}
+
+# (video pad, audio pad, duration) for one segment of the output timeline.
+Segment = Tuple[str, str, float]
+
+VIDEO_BITRATE = "8000k"
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    codec: str
+    # None for encoders without a -preset option (videotoolbox); the flag is then omitted.
+    preset: Optional[str]
+    params: Tuple[str, ...] = ()
+    # 8-bit 4:2:0 in the layout the encoder accepts; anything else many players reject.
+    pix_fmt: str = "yuv420p"
+
+
+# Hardware H.264 encoders in order of preference, then the software fallback.
+HARDWARE_ENCODERS = (
+    EncoderProfile("h264_nvenc", "p4", ("-rc", "vbr", "-maxrate", "10M")),
+    EncoderProfile("h264_videotoolbox", None),
+    EncoderProfile("h264_qsv", "veryfast", pix_fmt="nv12"),
+)
+SOFTWARE_ENCODER = EncoderProfile("libx264", "veryfast")
+
+
+def ffmpeg_binary() -> str:
+    """Path to the ffmpeg executable MoviePy is configured with (imageio-ffmpeg or system)."""
+    try:
+        from moviepy.config import FFMPEG_BINARY
+
+        return FFMPEG_BINARY
+    except Exception:
+        return "ffmpeg"
+
+
+def run_ffmpeg(args: Sequence[str]) -> None:
+    """Run ffmpeg with the given arguments, raising RuntimeError with stderr on failure."""
+    cmd = [ffmpeg_binary(), "-hide_banner", "-nostdin", "-loglevel", "error", "-y", *args]
+    # Only stderr carries anything we read; stdout and stdin are never piped.
+    result = subprocess.run(
+        cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed ({result.returncode}): {result.stderr.strip()}")
+
+
+def media_duration(path: Path) -> float:
+    """Duration in seconds as reported by ffmpeg's container parser."""
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+
+    return float(ffmpeg_parse_infos(str(path))["duration"])
+
+
+def audio_duration(path: Path) -> float:
+    """Duration of an audio file read from its header, without decoding or spawning ffmpeg.
+
+    Uses soundfile for WAV/FLAC/OGG and mutagen for MP3/M4A when installed,
+    falling back to ffmpeg's parser for anything they cannot read.
+    """
+    path = Path(path)
+    try:
+        if soundfile is not None and path.suffix.lower() in SOUNDFILE_SUFFIXES:
+            return float(soundfile.info(str(path)).duration)
+        if mutagen is not None:
+            info = mutagen.File(str(path))
+            if info is not None and info.info.length:
+                return float(info.info.length)
+    except Exception as e:
+        logger.debug("Header probe failed for %s: %s", path, e)
+    return media_duration(path)
+
+
+def probe_audio(path: Path) -> Optional[Tuple[str, int]]:
+    """(codec, bit_rate) of the first audio stream via ffprobe, or None if unknown."""
+    ffprobe = shutil.which("ffprobe")
+    if not ffprobe:
+        return None
+    try:
+        result = subprocess.run(
+            [
+                ffprobe, "-v", "error", "-select_streams", "a:0",
+                "-show_entries", "stream=codec_name,bit_rate", "-of", "json", str(path),
+            ],
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+        streams = json.loads(result.stdout or "{}").get("streams") or []
+    except Exception:
+        return None
+    if not streams:
+        return None
+    return streams[0].get("codec_name", ""), int(streams[0].get("bit_rate") or 0)
+
+
+def mux_audio(video: Path, audio: Path, dest: Path) -> Path:
+    """Mux ``audio`` under ``video`` without re-encoding either stream."""
+    run_ffmpeg(
+        ["-i", str(video), "-i", str(audio), "-map", "0:v", "-map", "1:a", "-c", "copy", "-shortest", str(dest)]
+    )
+    return dest
+
+
+def loop_audio(src: Path, dest: Path, duration: float, volume: float = 1.0) -> Path:
+    """Loop ``src`` until ``duration`` seconds and encode it to AAC at ``volume``."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    run_ffmpeg(
+        [
+            "-stream_loop",
+            "-1",
+            "-i",
+            str(src),
+            "-t",
+            f"{duration:.3f}",
+            "-filter:a",
+            f"volume={volume}",
+            "-c:a",
+            "aac",
+            str(dest),
+        ]
+    )
+    return dest
+
+
+def trim_media(src: Path, dest: Path, duration: float) -> Path:
+    """Cut the first ``duration`` seconds of ``src`` into ``dest``, stream-copying when possible."""
+    try:
+        run_ffmpeg(["-ss", "0", "-t", f"{duration:.3f}", "-i", str(src), "-c", "copy", "-an", str(dest)])
+    except RuntimeError:
+        # Stream copy can fail on odd containers; transcode the range once instead.
+        run_ffmpeg(["-ss", "0", "-t", f"{duration:.3f}", "-i", str(src), "-an", str(dest)])
+    return dest
+
+
+def _escape(value: str, specials: str) -> str:
+    value = value.replace("\\", "\\\\")
+    for char in specials:
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+def escape_filter_value(value: str) -> str:
+    """Escape a filter option value for use inside a -filter_complex graph.
+
+    ffmpeg applies two levels of unescaping: one for the option value and one
+    for the filtergraph description, so both sets of specials are escaped.
+    """
+    return _escape(_escape(value, "':"), "'[],;")
+
+
+def _encoder_works(profile: EncoderProfile) -> bool:
+    # Builds often list hardware encoders without a usable device; a tiny test encode tells.
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+        "-c:v", profile.codec, "-pix_fmt", profile.pix_fmt, "-f", "null", "-",
+    ]
+    try:
+        return subprocess.run(cmd, capture_output=True, timeout=30).returncode == 0
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=1)
+def detect_h264_encoder() -> EncoderProfile:
+    """Pick the fastest working H.264 encoder once per process."""
+    try:
+        listing = subprocess.run(
+            [ffmpeg_binary(), "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=30
+        ).stdout
+    except Exception:
+        listing = ""
+    for profile in HARDWARE_ENCODERS:
+        if profile.codec in listing and _encoder_works(profile):
+            logger.info("[FFmpeg] Using hardware encoder %s", profile.codec)
+            return profile
+    return SOFTWARE_ENCODER
+
+
+def video_encoder_args(fps: int) -> List[str]:
+    """Output codec arguments shared by every final ffmpeg encode."""
+    profile = detect_h264_encoder()
+    args = ["-r", str(fps), "-c:v", profile.codec, "-pix_fmt", profile.pix_fmt]
+    if profile.preset:
+        args += ["-preset", profile.preset]
+    return args + ["-b:v", VIDEO_BITRATE, *profile.params, "-threads", "0"]
+
+
+def encode_frames(
+    frames: Iterable,
+    size: Tuple[int, int],
+    fps: int,
+    dest: Path,
+    audio: Optional[Path] = None,
+    video_filters: Sequence[str] = (),
+) -> Path:
+    """Pipe RGB ``frames`` (uint8 arrays of ``size``) into ffmpeg with the shared encoder args.
+
+    Used instead of MoviePy's writer, which always passes ``-preset`` and picks
+    its own pixel format whatever the encoder. ``audio`` is stream-copied in.
+    """
+    width, height = size
+    cmd = [
+        ffmpeg_binary(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+    ]
+    if audio:
+        cmd += ["-i", str(audio)]
+    cmd += ["-map", "0:v"]
+    if audio:
+        cmd += ["-map", "1:a", "-c:a", "copy"]
+    if video_filters:
+        cmd += ["-vf", ",".join(video_filters)]
+    cmd += [*video_encoder_args(fps), str(dest)]
+
+    # stderr goes to a file so a chatty ffmpeg can never block on a full pipe.
+    with tempfile.TemporaryFile() as errors:
+        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=errors)
+        try:
+            for frame in frames:
+                proc.stdin.write(frame.tobytes())
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its stderr explains why.
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            returncode = proc.wait()
+        if returncode != 0:
+            errors.seek(0)
+            message = errors.read().decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"ffmpeg failed ({returncode}): {message}")
+    return dest
+
+
+class FilterGraph:
+    """Collects ffmpeg inputs and filter chains for a single -filter_complex invocation."""
+
+    def __init__(self):
+        self.input_args: List[str] = []
+        self.filters: List[str] = []
+        self._count = 0
+
+    def add_input(self, *args: str) -> int:
+        self.input_args.extend(args)
+        index = self._count
+        self._count += 1
+        return index
+
+    def add(self, chain: str) -> None:
+        self.filters.append(chain)
+
+    def join(self, segments: List[Segment], crossfade_sec: float) -> Tuple[str, str]:
+        """Join segments in order, crossfading with xfade/acrossfade when requested."""
+        if len(segments) == 1:
+            video, audio, _ = segments[0]
+            return video, audio
+        if crossfade_sec <= 0:
+            pads = "".join(f"{video}{audio}" for video, audio, _ in segments)
+            self.add(f"{pads}concat=n={len(segments)}:v=1:a=1[vjoin][ajoin]")
+            return "[vjoin]", "[ajoin]"
+
+        video, audio, length = segments[0]
+        for pos, (next_video, next_audio, duration) in enumerate(segments[1:], start=1):
+            offset = max(0.0, length - crossfade_sec)
+            self.add(
+                f"{video}{next_video}xfade=transition=fade:duration={crossfade_sec}"
+                f":offset={offset:.3f}[vx{pos}]"
+            )
+            self.add(f"{audio}{next_audio}acrossfade=d={crossfade_sec}[ax{pos}]")
+            video, audio = f"[vx{pos}]", f"[ax{pos}]"
+            length = offset + duration
+        return video, audio
+
+    def mix_background(self, audio: str, music_path: Optional[Path], volume: float = 0.2) -> str:
+        """Loop background music under ``audio``; returns the mixed pad (or ``audio`` unchanged)."""
+        if not music_path or not Path(music_path).exists():
+            return audio
+        music = self.add_input("-stream_loop", "-1", "-i", str(music_path))
+        self.add(f"[{music}:a]volume={volume}[bgm]")
+        self.add(f"{audio}[bgm]amix=inputs=2:duration=first:normalize=0[amixed]")
+        return "[amixed]"
+
+    def args(self) -> List[str]:
+        return [*self.input_args, "-filter_complex", ";".join(self.filters)]
+
+
+def write_concat_list(paths: Sequence[Path], dest: Path) -> Path:
+    """Write a concat demuxer list file for ``paths``."""
+    lines = []
+    for path in paths:
+        quoted = str(Path(path).resolve()).replace("'", "'\\''")
+        lines.append(f"file '{quoted}'")
+    dest.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return dest
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+# Buffer for files written from SDK streams, so multi-megabyte audio lands in a few writes.
+WRITE_BUFFER_SIZE = 1 << 20
+# RAM-backed scratch is only used while it has at least this much room.
+SCRATCH_MIN_FREE = 500 * 1024 * 1024
+
+
+def scratch_root() -> str:
+    """Directory for short-lived job files: tmpfs (/dev/shm) when writable and roomy, else the temp dir.
+
+    Scene assets are written, read back by ffmpeg and deleted, so keeping them
+    in RAM skips the disk round trip.
+    """
+    for candidate in ("/dev/shm", os.environ.get("XDG_RUNTIME_DIR")):
+        if not candidate or not os.path.isdir(candidate) or not os.access(candidate, os.W_OK):
+            continue
+        try:
+            if shutil.disk_usage(candidate).free > SCRATCH_MIN_FREE:
+                return candidate
+        except OSError:
+            continue
+    return tempfile.gettempdir()
+
+
+def atomic_write(dest: Path, data: bytes) -> Path:
+    """Write ``data`` to ``dest`` through a ``.part`` file renamed into place.
+
+    The file is unbuffered and written from a memoryview, so a large payload is
+    handed to ``write()`` without an extra copy; readers never see half a file.
+    """
+    part = dest.with_name(dest.name + ".part")
+    try:
+        with open(part, "wb", buffering=0) as fh:
+            view = memoryview(data)
+            while view:
+                view = view[fh.write(view):]
+        os.replace(part, dest)
+    finally:
+        part.unlink(missing_ok=True)
+    return dest
+
+
+def move_into_place(src: Path, dest: Path) -> Path:
+    """Move ``src`` to ``dest``; across filesystems it is copied to a ``.part`` file first.
+
+    Readers of ``dest`` never see a partially copied file.
+    """
+    try:
+        os.replace(src, dest)
+        return dest
+    except OSError:
+        pass  # Different filesystem (e.g. tmpfs scratch to a mounted output dir).
+    part = dest.with_name(dest.name + ".part")
+    try:
+        with open(src, "rb") as reader, open(part, "wb") as writer:
+            shutil.copyfileobj(reader, writer, WRITE_BUFFER_SIZE)
+        os.replace(part, dest)
+    finally:
+        part.unlink(missing_ok=True)
+    Path(src).unlink(missing_ok=True)
+    return dest
+
+
+@contextmanager
+def open_atomic(dest: Path) -> Iterator[BinaryIO]:
+    """Open a ``.part`` sibling of ``dest`` for buffered writing; renamed into place on success."""
+    part = dest.with_name(dest.name + ".part")
+    try:
+        with open(part, "wb", buffering=WRITE_BUFFER_SIZE) as fh:
+            yield fh
+        os.replace(part, dest)
+    finally:
+        part.unlink(missing_ok=True)
+
+
+def stream_to_file(
+    response, dest: Path, min_bytes: int = 0, validate: Optional[Callable[[Path], None]] = None
+) -> int:
+    """Write a streamed HTTP response body to ``dest`` chunk by chunk.
+
+    Bytes land in a ``.part`` sibling that replaces ``dest`` only once the body
+    is complete, at least ``min_bytes`` long and accepted by ``validate`` (which
+    raises to reject it), so a short, interrupted or corrupt download never
+    leaves a file behind. Returns the byte count.
+    """
+    part = dest.with_name(dest.name + ".part")
+    total = 0
+    try:
+        with open(part, "wb") as fh:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                fh.write(chunk)
+                total += len(chunk)
+        if total < min_bytes:
+            raise RuntimeError(f"Downloaded file too small ({total} bytes)")
+        if validate:
+            validate(part)
+        part.replace(dest)
+        return total
+    finally:
+        part.unlink(missing_ok=True)
+        response.close()
@@ -0,0 +1,30 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_SIZE = 16
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def build_session(max_connections: int = POOL_SIZE) -> requests.Session:
+    """Session with pooled keep-alive connections and exponential-backoff retries.
+
+    At most ``max_connections`` requests per host are in flight; further
+    callers block until a connection is returned instead of opening more and
+    tripping the provider's rate limit.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Hand the last response back so callers report the real status code.
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_SIZE, pool_maxsize=max_connections, max_retries=retries, pool_block=True
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
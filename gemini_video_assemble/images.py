@@ -1,21 +1,47 @@
 from pathlib import Path
 from io import BytesIO
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from google.genai import types
 from google import genai
 from PIL import Image
 import requests
 
+from .cache import SEARCH_TTL_SEC, DiskCache, request_key
+from .fileio import atomic_write, stream_to_file
+from .http_client import build_session
+
+# Concurrent requests generate_many keeps in flight against the Gemini API.
+GENERATE_MANY_WORKERS = 4
+
+
+def _verify_image(path: Path) -> None:
+    # verify() checks structure and checksums without decoding pixels; truncated files fail here.
+    with Image.open(path) as img:
+        img.verify()
+
+
+def _png_bytes(data: bytes, mime_type: Optional[str]) -> bytes:
+    """``data`` as PNG; other formats the model returns (JPEG, WebP) are re-encoded."""
+    if mime_type == "image/png":
+        return data
+    with Image.open(BytesIO(data)) as img:
+        out = BytesIO()
+        img.save(out, format="PNG")
+    return out.getvalue()
+
 
 class GeminiImageClient:
     """
     Uses google-genai client. Supports generate_images (Imagen) or generate_content (Gemini image).
     """
 
-    def __init__(self, api_key: str, model: str = "imagen-3.0-generate-001", method: str = "generate_images"):
-        if not api_key:
+    def __init__(
+        self, client: genai.Client, model: str = "imagen-3.0-generate-001", method: str = "generate_images"
+    ):
+        if client is None:
             raise RuntimeError("GOOGLE_API_KEY required for gemini provider")
-        self.client = genai.Client(api_key=api_key)
+        self.client = client
         self.model = model
         self.method = method
 
@@ -30,10 +56,10 @@ class GeminiImageClient:
 
             if response.parts:
                 for part in response.parts:
-                    if part.inline_data:
+                    if part.inline_data and part.inline_data.data:
                         try:
-                            img = part.as_image()
-                            img.save(dest)
+                            # Already in memory; written as-is when the model returned PNG.
+                            atomic_write(dest, _png_bytes(part.inline_data.data, part.inline_data.mime_type))
                             return dest
                         except Exception as e:
                             print(f"Error saving image part: {e}")
@@ -49,53 +75,103 @@ class GeminiImageClient:
             raise RuntimeError(error_msg)
         
         else:
-            response = self.client.models.generate_images(
-                model=self.model,
-                prompt=prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                ),
-            )
+            atomic_write(dest, self._imagen_images(prompt, 1)[0])
+            return dest
 
-            if not response.generated_images:
-                raise RuntimeError("Imagen returned no images")
-            
-            image_obj = response.generated_images[0]
+    def _imagen_images(self, prompt: str, count: int) -> List[bytes]:
+        response = self.client.models.generate_images(
+            model=self.model,
+            prompt=prompt,
+            config=types.GenerateImagesConfig(
+                number_of_images=count,
+            ),
+        )
+
+        if not response.generated_images:
+            raise RuntimeError("Imagen returned no images")
 
+        images = []
+        for image_obj in response.generated_images:
             image_bytes = None
             if hasattr(image_obj, "image") and image_obj.image:
                 image_bytes = image_obj.image.image_bytes
-            
             if not image_bytes:
                 raise RuntimeError("Imagen response missing image payload")
-            
-            dest.write_bytes(image_bytes)
-            return dest
+            images.append(_png_bytes(image_bytes, image_obj.image.mime_type))
+        if len(images) < count:
+            raise RuntimeError(f"Imagen returned {len(images)} of {count} images")
+        return images
+
+    def generate_many(self, prompts: List[str], dests: List[Path]) -> List[Path]:
+        """Generate one image per prompt.
+
+        Identical Imagen prompts are served by a single request with
+        ``number_of_images``; everything else is issued concurrently over the
+        shared client, since one multi-part generate_content call does not map
+        its images back to prompts reliably.
+        """
+        if len(prompts) != len(dests):
+            raise ValueError("prompts and dests must have the same length")
+        if not prompts:
+            return []
+        if self.method.lower() != "generate_content" and len(prompts) > 1 and len(set(prompts)) == 1:
+            try:
+                for dest, image_bytes in zip(dests, self._imagen_images(prompts[0], len(prompts))):
+                    atomic_write(dest, image_bytes)
+                return list(dests)
+            except Exception as e:
+                print(f"Batched Imagen request failed ({e}); generating images one by one")
+        with ThreadPoolExecutor(max_workers=min(GENERATE_MANY_WORKERS, len(prompts))) as pool:
+            return list(pool.map(self.generate, prompts, dests))
 
 
 class PixabayImageClient:
     """Stock image fetcher using Pixabay (requires API key)."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+        search_ttl: float = SEARCH_TTL_SEC,
+    ):
         if not api_key:
             raise RuntimeError("PIXABAY_KEY required for stock provider")
         self.api_key = api_key
         self.image_url = "https://pixabay.com/api/"
+        self.session = session or build_session()
+        self.cache = cache
+        # Results carry expiring CDN URLs, so cached searches are refetched after this.
+        self.search_ttl = search_ttl
 
     def _fetch(self, url: str, params: dict) -> dict:
-        resp = requests.get(url, params=params, timeout=60)
+        if self.cache:
+            return self.cache.json(
+                request_key(url, params), lambda: self._request_json(url, params), ttl=self.search_ttl
+            )
+        return self._request_json(url, params)
+
+    def _request_json(self, url: str, params: dict) -> dict:
+        resp = self.session.get(url, params=params, timeout=60)
         if resp.status_code != 200:
             raise RuntimeError(f"Pixabay failed ({resp.status_code}): {resp.text}")
         return resp.json()
 
     def _download_image_with_validation(self, image_url: str, dest: Path) -> Path:
         """Download image with validation to ensure file integrity."""
-        img_resp = requests.get(image_url, timeout=60)
+        if self.cache:
+            return self.cache.blob(image_url, dest, lambda path: self._download_image(image_url, path))
+        return self._download_image(image_url, dest)
+
+    def _download_image(self, image_url: str, dest: Path) -> Path:
+        img_resp = self.session.get(image_url, timeout=60, stream=True)
         if img_resp.status_code != 200:
+            img_resp.close()
             raise RuntimeError(f"Pixabay image download failed ({img_resp.status_code})")
-        if not img_resp.content or len(img_resp.content) < 1000:
-            raise RuntimeError("Pixabay image download incomplete or corrupted")
-        dest.write_bytes(img_resp.content)
+        try:
+            stream_to_file(img_resp, dest, validate=_verify_image)
+        except Exception as e:
+            raise RuntimeError("Pixabay image download incomplete or corrupted") from e
         return dest
 
     def generate_image(self, prompt: str, dest: Path, orientation: str = "horizontal") -> Path:
@@ -114,8 +190,15 @@ class PixabayImageClient:
         hits = data.get("hits", [])
         if not hits:
             raise RuntimeError("Pixabay returned no images")
+        # Pick the hit closest to the target aspect so less of the frame is cropped;
+        # min() keeps Pixabay's relevance order among equal ratios.
+        target_ratio = 16 / 9 if orientation == "horizontal" else 9 / 16
+        best = min(
+            hits,
+            key=lambda h: abs((h.get("imageWidth") or 1) / max(h.get("imageHeight") or 1, 1) - target_ratio),
+        )
         # Prioritize highest resolution available (largeImageURL is typically 1920px wide)
-        image_url = hits[0].get("largeImageURL") or hits[0].get("webformatURL")
+        image_url = best.get("largeImageURL") or best.get("webformatURL")
         if not image_url:
             raise RuntimeError("Pixabay hit missing image URL")
         return self._download_image_with_validation(image_url, dest)
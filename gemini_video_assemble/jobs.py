@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .pipeline import VideoPipeline
+from .storage import DataStore
+
+# Identical requests within this many seconds share one run.
+DEDUP_WINDOW_SEC = 3600
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RenderQueue:
+    """
+    In-process render queue backing the web routes.
+
+    Requests record a pending run and return immediately; a fixed pool of
+    worker threads runs the pipeline, so concurrent renders are bounded by
+    ``workers`` rather than by how many request threads the server has.
+    Progress lives in the run history, which the status endpoint reads.
+
+    A request identical to one this process is still rendering, or to one
+    finished (with its video on disk) within ``DEDUP_WINDOW_SEC``, returns that
+    run instead of rendering again. Each run records the host and pid that
+    owns it; on start, unfinished runs whose owner is gone are marked failed.
+    """
+
+    def __init__(self, data_store: DataStore, build_pipeline: Callable[[], VideoPipeline], workers: int = 1):
+        self.data_store = data_store
+        self.build_pipeline = build_pipeline
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="render")
+        self._futures: Dict[str, Future] = {}
+        self._submit_lock = threading.Lock()
+        self._host = socket.gethostname()
+        self.owner = f"{self._host}:{os.getpid()}"
+        self._fail_orphaned_runs()
+
+    def _fail_orphaned_runs(self) -> None:
+        """Mark runs left pending/running by a dead process on this host as failed.
+
+        Runs owned by live processes (other gunicorn workers) or other hosts are left alone.
+        """
+        for run in self.data_store.unfinished_runs():
+            host, _, pid = (run["owner"] or "").rpartition(":")
+            if run["owner"] and (host != self._host or not pid.isdigit() or _process_alive(int(pid))):
+                continue
+            self.data_store.update_run(run["id"], status="failed", error="Render interrupted by a server restart")
+
+    @staticmethod
+    def request_key(prompt: str, duration: int, scenes: int, aspect: str, image_provider: str) -> str:
+        payload = {
+            "prompt": prompt,
+            "duration": duration,
+            "scenes": scenes,
+            "aspect": aspect,
+            "image_provider": image_provider,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _reusable_run(self, key: str) -> Optional[str]:
+        for run in self.data_store.find_runs(key, DEDUP_WINDOW_SEC):
+            # Only runs this process is rendering are known to be alive.
+            if run["status"] in {"pending", "running"} and run["id"] in self._futures:
+                return run["id"]
+            if run["status"] == "completed" and run["output_path"] and Path(run["output_path"]).exists():
+                return run["id"]
+        return None
+
+    def submit(
+        self, prompt: str, duration: int, scenes: int, aspect: str, image_provider: str
+    ) -> Tuple[str, bool]:
+        """Queue a render; returns the run id and whether an existing run was reused."""
+        key = self.request_key(prompt, duration, scenes, aspect, image_provider)
+        # Serialized so two identical requests arriving together cannot both miss.
+        with self._submit_lock:
+            existing = self._reusable_run(key)
+            if existing:
+                return existing, True
+            run_id = self.data_store.record_run(
+                prompt=prompt,
+                duration=duration,
+                scenes=scenes,
+                aspect=aspect,
+                image_provider=image_provider,
+                status="pending",
+                request_key=key,
+                owner=self.owner,
+            )
+            future = self._executor.submit(self._render, run_id, prompt, duration, scenes, aspect, image_provider)
+            self._futures[run_id] = future
+        future.add_done_callback(lambda _: self._futures.pop(run_id, None))
+        return run_id, False
+
+    def _render(self, run_id: str, prompt: str, duration: int, scenes: int, aspect: str, image_provider: str):
+        self.data_store.update_run(run_id, status="running")
+        try:
+            pipeline = self.build_pipeline()
+            output_path = pipeline.build_video_from_prompt(prompt, duration, scenes, aspect, image_provider)
+            self._upload(pipeline, output_path)
+            self.data_store.update_run(run_id, status="completed", output_path=str(output_path))
+        except Exception as exc:
+            self.data_store.update_run(run_id, status="failed", error=str(exc))
+            print(f"Background render failed for run {run_id}: {exc}")
+
+    def _upload(self, pipeline: VideoPipeline, output_path: Path) -> None:
+        settings = pipeline.settings
+        if not (settings.s3_bucket_name and settings.aws_access_key_id and settings.aws_secret_access_key):
+            return
+        try:
+            from .s3_uploader import S3Uploader
+
+            uploader = S3Uploader(
+                settings.aws_access_key_id,
+                settings.aws_secret_access_key,
+                settings.aws_region,
+                settings.s3_bucket_name,
+            )
+            s3_url = uploader.upload(output_path, settings.s3_prefix)
+            print(f"Successfully uploaded to S3: {s3_url}")
+        except Exception as e:
+            print(f"Warning: S3 Upload failed: {e}")
+
+    def pending(self) -> int:
+        """Renders queued or running in this process."""
+        return len(self._futures)
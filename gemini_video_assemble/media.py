@@ -1,22 +1,56 @@
 from pathlib import Path
+from typing import Optional
+
 import requests
 
+from .cache import SEARCH_TTL_SEC, DiskCache, request_key
+from .fileio import stream_to_file
+from .http_client import build_session
+
 
 class PixabayVideoClient:
     """Pixabay video fetcher."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+        search_ttl: float = SEARCH_TTL_SEC,
+    ):
         if not api_key:
             raise RuntimeError("PIXABAY_KEY required for video provider")
         self.api_key = api_key
         self.video_url = "https://pixabay.com/api/videos/"
+        self.session = session or build_session()
+        self.cache = cache
+        # Results carry expiring CDN URLs, so cached searches are refetched after this.
+        self.search_ttl = search_ttl
 
     def _fetch(self, url: str, params: dict) -> dict:
-        resp = requests.get(url, params=params, timeout=60)
+        if self.cache:
+            return self.cache.json(
+                request_key(url, params), lambda: self._request_json(url, params), ttl=self.search_ttl
+            )
+        return self._request_json(url, params)
+
+    def _request_json(self, url: str, params: dict) -> dict:
+        resp = self.session.get(url, params=params, timeout=60)
         if resp.status_code != 200:
             raise RuntimeError(f"Pixabay failed ({resp.status_code}): {resp.text}")
         return resp.json()
 
+    def _download(self, url: str, dest: Path) -> Path:
+        v_resp = self.session.get(url, timeout=120, stream=True)
+        if v_resp.status_code != 200:
+            v_resp.close()
+            raise RuntimeError(f"HTTP {v_resp.status_code}")
+
+        # Stream to disk and validate file size (at least 100KB)
+        size = stream_to_file(v_resp, dest, min_bytes=100000)
+        print(f"Successfully downloaded video ({size} bytes)")
+        return dest
+
     def _download_with_fallback(self, candidates: list, dest: Path) -> Path:
         """Download video with fallback to smaller formats if larger ones fail."""
         last_error = None
@@ -26,20 +60,9 @@ class PixabayVideoClient:
                 if not url:
                     continue
                 print(f"Attempting to download video from {url}")
-                v_resp = requests.get(url, timeout=120, stream=True)
-                if v_resp.status_code != 200:
-                    last_error = f"HTTP {v_resp.status_code}"
-                    continue
-                
-                # Write content and validate file size
-                content = v_resp.content
-                if not content or len(content) < 100000:  # At least 100KB
-                    last_error = f"Downloaded file too small ({len(content)} bytes)"
-                    continue
-                
-                dest.write_bytes(content)
-                print(f"Successfully downloaded video ({len(content)} bytes)")
-                return dest
+                if self.cache:
+                    return self.cache.blob(url, dest, lambda path: self._download(url, path))
+                return self._download(url, dest)
             except Exception as e:
                 last_error = str(e)
                 print(f"Failed to download video: {e}")
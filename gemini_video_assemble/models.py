@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     title: str
     narration: str
@@ -18,3 +18,5 @@ class Scene:
     video_path: Optional[Path] = None
     sfx_path: Optional[Path] = None
     break_audio_path: Optional[Path] = None
+    # True once stock footage was downloaded; footage already moves, so no Ken Burns.
+    has_video: bool = False
@@ -1,17 +1,40 @@
 from pathlib import Path
+from typing import Optional
+
 import requests
 
+from .cache import SEARCH_TTL_SEC, DiskCache, request_key
+from .fileio import stream_to_file
+from .http_client import build_session
+
 
 class FreesoundClient:
     """Freesound background music and sound effect fetcher."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[DiskCache] = None,
+        session: Optional[requests.Session] = None,
+        search_ttl: float = SEARCH_TTL_SEC,
+    ):
         if not api_key:
             raise RuntimeError("FREESOUND_KEY required for music/sound provider")
         self.api_key = api_key
         self.api_url = "https://freesound.org/apiv2/search/text/"
+        self.session = session or build_session()
+        self.cache = cache
+        # Results carry expiring CDN URLs, so cached searches are refetched after this.
+        self.search_ttl = search_ttl
 
     def _fetch(self, params: dict) -> dict:
+        if self.cache:
+            return self.cache.json(
+                request_key(self.api_url, params), lambda: self._request_json(params), ttl=self.search_ttl
+            )
+        return self._request_json(params)
+
+    def _request_json(self, params: dict) -> dict:
         headers = {
             "Authorization": f"Token {self.api_key}"
         }
@@ -20,11 +43,22 @@ class FreesoundClient:
             print(f"[Freesound] GET {self.api_url} params={params}")
         except Exception:
             pass
-        resp = requests.get(self.api_url, params=params, headers=headers, timeout=60)
+        resp = self.session.get(self.api_url, params=params, headers=headers, timeout=60)
         if resp.status_code != 200:
             raise RuntimeError(f"Freesound failed ({resp.status_code}): {resp.text}")
         return resp.json()
 
+    def _download(self, audio_url: str, dest: Path) -> Path:
+        a_resp = self.session.get(audio_url, timeout=120, stream=True)
+        if a_resp.status_code != 200:
+            a_resp.close()
+            raise RuntimeError(f"HTTP {a_resp.status_code}")
+
+        # Stream to disk; at least 50KB for audio
+        size = stream_to_file(a_resp, dest, min_bytes=50000)
+        print(f"Successfully downloaded audio ({size} bytes)")
+        return dest
+
     def _download_with_fallback(self, candidates: list, dest: Path) -> Path:
         """Download audio with fallback to lower quality if needed."""
         last_error = None
@@ -33,20 +67,9 @@ class FreesoundClient:
                 if not audio_url:
                     continue
                 print(f"Attempting to download audio from {audio_url}")
-                a_resp = requests.get(audio_url, timeout=120, stream=True)
-                
-                if a_resp.status_code != 200:
-                    last_error = f"HTTP {a_resp.status_code}"
-                    continue
-                
-                content = a_resp.content
-                if not content or len(content) < 50000:  # At least 50KB for audio
-                    last_error = f"Downloaded file too small ({len(content)} bytes)"
-                    continue
-                
-                dest.write_bytes(content)
-                print(f"Successfully downloaded audio ({len(content)} bytes)")
-                return dest
+                if self.cache:
+                    return self.cache.blob(audio_url, dest, lambda path: self._download(audio_url, path))
+                return self._download(audio_url, dest)
             except Exception as e:
                 last_error = str(e)
                 print(f"Failed to download audio: {e}")
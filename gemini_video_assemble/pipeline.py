@@ -1,13 +1,26 @@
+import atexit
+import multiprocessing
+import os
+import re
 import shutil
 import tempfile
+import threading
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from google import genai
 
 from .assembler import VideoAssembler
+from .cache import DiskCache
 from .config import Settings
+from .ffmpeg_assembler import FFmpegAssembler
+from .fileio import move_into_place, scratch_root
+from .http_client import build_session
 from .images import GeminiImageClient, PixabayImageClient
 from .media import PixabayVideoClient
 from .music import FreesoundClient
@@ -15,15 +28,118 @@ from .models import Scene
 from .planner import PromptBuilder, ScenePlanner
 from .tts import AmazonPollySynthesizer, GoogleTTSSynthesizer, TTSSynthesizer
 
+# Remote fetches (visuals, SFX, music and the narration/image batches) in flight per render.
+ASSET_WORKERS = 24
+# Assembly processes when ASSEMBLER_WORKERS is 0; each holds decoded frames, so more rarely pays off.
+DEFAULT_ASSEMBLER_WORKERS = 4
+# Seconds interpreter shutdown waits for pending working-dir cleanups.
+CLEANUP_JOIN_TIMEOUT = 10.0
+
+# Pixabay caps queries at 100 characters; runs of whitespace only hurt matching.
+MAX_QUERY_LENGTH = 100
+_WS_RE = re.compile(r"\s+")
+
+_cleanup_threads: set[threading.Thread] = set()
+_cleanup_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _assembler_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool for per-scene assembly, created on first use and shared by every render."""
+    try:
+        # Spawn rather than fork: the server renders from background threads.
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    except (OSError, NotImplementedError) as e:
+        print(f"Assembly process pool unavailable ({e}); assembling scenes inline")
+        return None
+
+
+@lru_cache(maxsize=1024)
+def _trim_query(query: str) -> str:
+    return _WS_RE.sub(" ", query.strip())[:MAX_QUERY_LENGTH]
+
+
+def _remove_tree(path: Path) -> None:
+    try:
+        shutil.rmtree(path, ignore_errors=True)
+    finally:
+        with _cleanup_lock:
+            _cleanup_threads.discard(threading.current_thread())
+
+
+def _remove_tree_in_background(path: Path) -> None:
+    """Delete ``path`` off the request path; the caller does not wait for the unlinks."""
+    thread = threading.Thread(target=_remove_tree, args=(path,), name="working-dir-cleanup", daemon=True)
+    with _cleanup_lock:
+        _cleanup_threads.add(thread)
+    thread.start()
+
+
+@atexit.register
+def _join_cleanup_threads() -> None:
+    deadline = time.monotonic() + CLEANUP_JOIN_TIMEOUT
+    with _cleanup_lock:
+        pending = list(_cleanup_threads)
+    for thread in pending:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+
+# Provider clients hold HTTP connection pools (and the Gemini SDK its transport), so
+# they are built once per process for each configuration and shared across renders.
+@lru_cache(maxsize=4)
+def _genai_client(api_key: str) -> genai.Client:
+    """One google-genai client per key, shared by the planner and the image client."""
+    return genai.Client(api_key=api_key)
+
+
+@lru_cache(maxsize=4)
+def _scene_planner(api_key: str, model: str, cache_dir: Optional[Path], cache_ttl: int) -> ScenePlanner:
+    cache = DiskCache(cache_dir) if cache_dir else None
+    return ScenePlanner(_genai_client(api_key), model, cache=cache, cache_ttl=cache_ttl)
+
+
+@lru_cache(maxsize=4)
+def _gemini_image_client(api_key: str, model: str, method: str) -> GeminiImageClient:
+    return GeminiImageClient(_genai_client(api_key), model, method)
+
+
+@lru_cache(maxsize=4)
+def _pixabay_clients(
+    api_key: str, cache_dir: Path, max_bytes: int, max_concurrency: int, search_ttl: int
+) -> tuple[PixabayImageClient, PixabayVideoClient]:
+    # One session for both, so image and video requests share connections and the concurrency cap.
+    cache = DiskCache(cache_dir, max_bytes=max_bytes)
+    session = build_session(max_concurrency)
+    return (
+        PixabayImageClient(api_key, cache=cache, session=session, search_ttl=search_ttl),
+        PixabayVideoClient(api_key, cache=cache, session=session, search_ttl=search_ttl),
+    )
+
+
+@lru_cache(maxsize=4)
+def _freesound_client(
+    api_key: str, cache_dir: Path, max_bytes: int, max_concurrency: int, search_ttl: int
+) -> FreesoundClient:
+    cache = DiskCache(cache_dir, max_bytes=max_bytes)
+    return FreesoundClient(
+        api_key, cache=cache, session=build_session(max_concurrency), search_ttl=search_ttl
+    )
+
 
 class VideoPipeline:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.settings.require_core_keys()
-        self.gemini_client = genai.Client(api_key=self.settings.google_api_key)
-        self.scene_planner = ScenePlanner(self.gemini_client, self.settings.gemini_text_model)
+        self.gemini_client = _genai_client(self.settings.google_api_key)
+        self.scene_planner = _scene_planner(
+            self.settings.google_api_key,
+            self.settings.gemini_text_model,
+            self.settings.cache_dir if self.settings.enable_plan_cache else None,
+            self.settings.plan_cache_ttl,
+        )
         self.prompt_builder = PromptBuilder(self.settings.image_style)
         self.tts_client = self._build_tts_client()
+        self.image_client = self._build_image_client()
 
     def _build_tts_client(self) -> TTSSynthesizer:
         if self.settings.tts_provider == "polly":
@@ -47,7 +163,7 @@ class VideoPipeline:
     def _build_image_client(self) -> GeminiImageClient:
         model = self.settings.gemini_image_model
         method = "generate_images" if "imagen" in model.lower() else "generate_content"
-        return GeminiImageClient(self.settings.google_api_key, model, method)
+        return _gemini_image_client(self.settings.google_api_key, model, method)
 
     def _aspect_to_size(self, aspect: str) -> tuple[int, int]:
         if aspect == "vertical":
@@ -55,10 +171,10 @@ class VideoPipeline:
         return self.settings.horizontal_size
 
     def _build_assembler(
-        self, aspect: str, background_music_path: Optional[Path] = None
+        self, target_size: tuple[int, int], background_music_path: Optional[Path] = None
     ) -> VideoAssembler:
-        target_size = self._aspect_to_size(aspect)
-        return VideoAssembler(
+        assembler_cls = FFmpegAssembler if self.settings.assembler_backend == "ffmpeg" else VideoAssembler
+        return assembler_cls(
             crossfade_sec=self.settings.crossfade_sec,
             kenburns_zoom=self.settings.kenburns_zoom,
             enable_subtitles=self.settings.enable_subtitles,
@@ -71,7 +187,114 @@ class VideoPipeline:
                 "target_size": target_size,
             },
             background_music_path=background_music_path,
+            segment_concat=self.settings.assembler_backend == "segments",
+            subtitle_renderer=self.settings.subtitle_renderer,
+        )
+
+    def _assembler_executor(self, scene_count: int) -> Optional[ProcessPoolExecutor]:
+        """Shared process pool for per-scene assembly work; None when running inline."""
+        workers = self.settings.assembler_workers or min(DEFAULT_ASSEMBLER_WORKERS, os.cpu_count() or 1)
+        if min(workers, scene_count) <= 1 or self.settings.assembler_backend == "ffmpeg":
+            return None
+        # Sized by settings alone so every render reuses the same warm workers.
+        return _assembler_pool(workers)
+
+    def _pick_visual_strategy(
+        self, provider: str, prompt: str, target_size: tuple[int, int], orientation: str
+    ) -> Optional[Callable[[Scene], None]]:
+        """Resolve the provider and its clients once; the returned callable fetches one scene's visual.
+
+        Returns None for generated images, which ``_generate_images`` requests
+        for the whole plan at once.
+        """
+
+        def search_term(scene: Scene) -> str:
+            return _trim_query(scene.search_query or scene.visual_prompt or prompt)
+
+        if provider == "stock":
+            if not self.settings.pixabay_key:
+                raise RuntimeError("PIXABAY_KEY required for stock provider")
+            image_client, video_client = _pixabay_clients(
+                self.settings.pixabay_key,
+                self.settings.cache_dir,
+                self.settings.media_cache_bytes,
+                self.settings.pixabay_max_concurrency,
+                self.settings.search_cache_ttl,
+            )
+
+            def fetch_stock(scene: Scene) -> None:
+                term = search_term(scene)
+                try:
+                    video_client.generate_video(term, scene.video_path, target_size=target_size)
+                    scene.has_video = True
+                except Exception:
+                    image_client.generate_image(term, scene.image_path, orientation=orientation)
+
+            return fetch_stock
+
+        return None
+
+    def _generate_images(self, scene_plan: list[Scene]) -> None:
+        prompts = [self.prompt_builder.build(scene) for scene in scene_plan]
+        self.image_client.generate_many(prompts, [scene.image_path for scene in scene_plan])
+
+    def _fetch_sfx(self, idx: int, scene: Scene, freesound_client: FreesoundClient) -> None:
+        try:
+            print(f"[SFX] Fetching sound effect for scene {idx}: '{scene.sfx_keywords}'")
+            freesound_client.generate_sound_effect(scene.sfx_keywords, scene.sfx_path)
+        except Exception as e:
+            print(f"[SFX] Warning: Could not get SFX for scene {idx}: {e}")
+            scene.sfx_path = None
+
+    def _fetch_break_audio(self, working_dir: Path, freesound_client: FreesoundClient) -> Optional[Path]:
+        """Download the transition sound shared by every break clip; None when unavailable."""
+        dest = working_dir / "break_audio.mp3"
+        try:
+            print("[Break Audio] Fetching transition audio for breaks")
+            freesound_client.generate_sound_effect("transition whoosh", dest)
+            return dest
+        except Exception as e:
+            print(f"[Break Audio] Warning: Could not get break audio: {e}")
+            return None
+
+    def _synthesize_narration(self, scene_plan: list[Scene]) -> None:
+        self.tts_client.synthesize_many(
+            [scene.narration for scene in scene_plan], [scene.audio_path for scene in scene_plan]
         )
+        for scene in scene_plan:
+            scene.subtitle = scene.narration
+
+    def _fetch_background_music(
+        self, scene_plan: list[Scene], working_dir: Path, freesound_client: Optional[FreesoundClient]
+    ) -> Optional[Path]:
+        """Download background music for the planner's first music keywords; None when unavailable."""
+        if not freesound_client:
+            print("[Music] FREESOUND_KEY not set; skipping background music.")
+            return None
+        print("[Music] Freesound key available, attempting to get background music...")
+        try:
+            music_query = None
+            for idx, scene in enumerate(scene_plan):
+                print(f"[Music] Scene {idx}: music_keywords = '{scene.music_keywords}'")
+                if scene.music_keywords:
+                    music_query = scene.music_keywords
+                    break
+            if not music_query:
+                print(
+                    "[Music] No planner-provided music keywords found in any scene; skipping background music."
+                )
+                return None
+            print(f"[Music] Using planner keywords for Freesound: '{music_query}'")
+            background_music_path = working_dir / "background_music.mp3"
+            freesound_client.generate_background_music(music_query, background_music_path)
+            print(f"[Music] Background music saved to: {background_music_path}")
+            exists = background_music_path.exists()
+            size = background_music_path.stat().st_size if exists else "N/A"
+            print(f"[Music] File exists: {exists}, Size: {size} bytes")
+            return background_music_path
+        except Exception as e:
+            print(f"Warning: Could not get background music: {e}")
+            return None
 
     def build_video_from_prompt(
         self,
@@ -81,101 +304,93 @@ class VideoPipeline:
         aspect: str | None = None,
         image_provider: str | None = None,
     ) -> Path:
-        working_dir = Path(tempfile.mkdtemp(prefix="video-job-"))
-        scene_plan = self.scene_planner.plan(prompt, duration, scenes)
-        aspect_choice = aspect or self.settings.default_aspect
+        self.settings.ensure_dirs()
+        working_dir = Path(tempfile.mkdtemp(prefix="video-job-", dir=scratch_root()))
+        try:
+            aspect_choice = aspect or self.settings.default_aspect
 
-        background_music_path = None
-        if self.settings.freesound_key:
-            print("[Music] Freesound key available, attempting to get background music...")
-            try:
-                freesound_client = FreesoundClient(self.settings.freesound_key)
-                music_query = None
-                for idx, scene in enumerate(scene_plan):
-                    print(f"[Music] Scene {idx}: music_keywords = '{scene.music_keywords}'")
-                    if scene.music_keywords:
-                        music_query = scene.music_keywords
-                        break
-                if music_query:
-                    print(f"[Music] Using planner keywords for Freesound: '{music_query}'")
-                    background_music_path = working_dir / "background_music.mp3"
-                    freesound_client.generate_background_music(music_query, background_music_path)
-                    print(f"[Music] Background music saved to: {background_music_path}")
-                    exists = background_music_path.exists()
-                    size = background_music_path.stat().st_size if exists else "N/A"
-                    print(f"[Music] File exists: {exists}, Size: {size} bytes")
-                else:
-                    print(
-                        "[Music] No planner-provided music keywords found in any scene; skipping background music."
-                    )
-            except Exception as e:
-                print(f"Warning: Could not get background music: {e}")
-        else:
-            print("[Music] FREESOUND_KEY not set; skipping background music.")
+            freesound_client = None
+            if self.settings.freesound_key:
+                freesound_client = _freesound_client(
+                    self.settings.freesound_key,
+                    self.settings.cache_dir,
+                    self.settings.media_cache_bytes,
+                    self.settings.freesound_max_concurrency,
+                    self.settings.search_cache_ttl,
+                )
 
-        assembler = self._build_assembler(aspect_choice, background_music_path)
-        provider = (image_provider or "").lower()
-        if provider not in {"gemini", "stock"}:
-            raise RuntimeError("image_provider is required and must be 'gemini' or 'stock'")
-        target_size = self._aspect_to_size(aspect_choice)
-        orientation = "vertical" if aspect_choice == "vertical" else "horizontal"
+            provider = (image_provider or "").lower()
+            if provider not in {"gemini", "stock"}:
+                raise RuntimeError("image_provider is required and must be 'gemini' or 'stock'")
+            target_size = self._aspect_to_size(aspect_choice)
+            orientation = "vertical" if aspect_choice == "vertical" else "horizontal"
 
-        pixabay_image_client = None
-        pixabay_video_client = None
-        if provider == "stock":
-            if not self.settings.pixabay_key:
-                raise RuntimeError("PIXABAY_KEY required for stock provider")
-            pixabay_image_client = PixabayImageClient(self.settings.pixabay_key)
-            pixabay_video_client = PixabayVideoClient(self.settings.pixabay_key)
-
-        freesound_client = None
-        if self.settings.freesound_key:
-            freesound_client = FreesoundClient(self.settings.freesound_key)
-
-        print(f"Planned {len(scene_plan)} scenes for prompt '{prompt}'")
-
-        for idx, scene in enumerate(scene_plan):
-            scene.image_path = working_dir / f"scene_{idx}.png"
-            scene.audio_path = working_dir / f"scene_{idx}.mp3"
-            scene.video_path = working_dir / f"scene_{idx}.mp4"
-            scene.sfx_path = working_dir / f"scene_{idx}_sfx.mp3"
-            scene.break_audio_path = working_dir / f"scene_{idx}_break_audio.mp3"
-            full_prompt = self.prompt_builder.build(scene)
-            search_term = (scene.search_query or scene.visual_prompt or prompt).strip()
-            if len(search_term) > 100:
-                search_term = search_term[:100]
-            if provider == "stock":
-                try:
-                    pixabay_video_client.generate_video(
-                        search_term, scene.video_path, target_size=target_size
-                    )
-                except Exception:
-                    pixabay_image_client.generate_image(
-                        search_term, scene.image_path, orientation=orientation
-                    )
-            else:
-                self._build_image_client().generate(full_prompt, scene.image_path)
-            self.tts_client.synthesize(scene.narration, scene.audio_path)
-            scene.subtitle = scene.narration
+            generate_visual = self._pick_visual_strategy(provider, prompt, target_size, orientation)
 
-            if freesound_client and scene.sfx_keywords:
-                try:
-                    print(f"[SFX] Fetching sound effect for scene {idx}: '{scene.sfx_keywords}'")
-                    freesound_client.generate_sound_effect(scene.sfx_keywords, scene.sfx_path)
-                except Exception as e:
-                    print(f"[SFX] Warning: Could not get SFX for scene {idx}: {e}")
-                    scene.sfx_path = None
+            # Remote fetches go to this pool; its threads start lazily, so the cap costs nothing.
+            with ThreadPoolExecutor(max_workers=ASSET_WORKERS) as asset_pool:
+                # The break sound does not depend on the plan, so it downloads while the planner runs.
+                break_audio_future = (
+                    asset_pool.submit(self._fetch_break_audio, working_dir, freesound_client)
+                    if freesound_client
+                    else None
+                )
+                scene_plan = self.scene_planner.plan(prompt, duration, scenes)
+                print(f"Planned {len(scene_plan)} scenes for prompt '{prompt}'")
+
+                # Assign paths before any worker starts so no thread races on the Scene.
+                # Built from one string prefix rather than five Path joins per scene.
+                prefix = f"{working_dir}{os.sep}scene_"
+                for idx, scene in enumerate(scene_plan):
+                    scene.image_path = Path(f"{prefix}{idx}.png")
+                    scene.audio_path = Path(f"{prefix}{idx}.mp3")
+                    scene.video_path = Path(f"{prefix}{idx}.mp4")
+                    scene.sfx_path = Path(f"{prefix}{idx}_sfx.mp3")
 
-            if freesound_client:
+                # Background music only depends on the plan; fetch it alongside the scenes.
+                music_future = asset_pool.submit(
+                    self._fetch_background_music, scene_plan, working_dir, freesound_client
+                )
+                # Narration and generated images each go out as one batch; stock visuals
+                # and sound effects are one task per scene. Each task writes its own fields.
+                futures = [asset_pool.submit(self._synthesize_narration, scene_plan)]
+                if generate_visual is None:
+                    futures.append(asset_pool.submit(self._generate_images, scene_plan))
+                else:
+                    futures += [asset_pool.submit(generate_visual, scene) for scene in scene_plan]
+                if freesound_client:
+                    futures += [
+                        asset_pool.submit(self._fetch_sfx, idx, scene, freesound_client)
+                        for idx, scene in enumerate(scene_plan)
+                        if scene.sfx_keywords
+                    ]
                 try:
-                    print(f"[Break Audio] Fetching transition audio for break after scene {idx}")
-                    freesound_client.generate_sound_effect("transition whoosh", scene.break_audio_path)
-                except Exception as e:
-                    print(f"[Break Audio] Warning: Could not get break audio for scene {idx}: {e}")
-                    scene.break_audio_path = None
+                    for future in as_completed(futures):
+                        future.result()
+                except Exception:
+                    for future in futures:
+                        future.cancel()
+                    raise
+                background_music_path = music_future.result()
+                break_audio_path = break_audio_future.result() if break_audio_future else None
 
-        output_path = self.settings.output_dir / f"{uuid.uuid4()}.mp4"
-        assembler.build(scene_plan, output_path)
+            for scene in scene_plan:
+                scene.break_audio_path = break_audio_path
 
-        shutil.rmtree(working_dir, ignore_errors=True)
-        return output_path
+            assembler = self._build_assembler(target_size, background_music_path)
+
+            # Encode into scratch so a slow output mount never stalls ffmpeg, then move it over.
+            output_name = f"{uuid.uuid4()}.mp4"
+            executor = self._assembler_executor(len(scene_plan))
+            try:
+                rendered = assembler.build(scene_plan, working_dir / output_name, executor=executor)
+            except BrokenProcessPool as e:
+                # A worker died (often the OOM killer); later renders get a fresh pool, this one finishes inline.
+                print(f"Assembly process pool broke ({e}); assembling scenes inline")
+                _assembler_pool.cache_clear()
+                executor.shutdown(wait=False, cancel_futures=True)
+                rendered = assembler.build(scene_plan, working_dir / output_name)
+            return move_into_place(rendered, self.settings.output_dir / output_name)
+        finally:
+            # Failed renders leave scene files behind too; clear them either way.
+            _remove_tree_in_background(working_dir)
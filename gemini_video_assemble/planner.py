@@ -1,81 +1,159 @@
+import hashlib
 import json
-from typing import List
+from typing import List, Optional
 
 from google import genai
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+from .cache import DiskCache
 from .models import Scene
 
+# Static part of every planning request. Per-request values go in the user turn,
+# so this prefix is byte-identical across calls.
+PLAN_INSTRUCTION = (
+    "You are a film director. Break the topic into short scenes. "
+    "Return JSON with a 'scenes' array only. Each scene needs: "
+    "title, narration (2-3 sentences), visual_prompt, duration_sec "
+    "(so the total is close to the requested total seconds), search_terms "
+    "(short keyword string <= 5 words for stock image search), "
+    "music_keywords (short keyword string <= 6 words describing the background music mood/genre, e.g., 'ambient cinematic soft'), and "
+    "sfx_keywords (short keyword string <= 3 words for a scene-specific sound effect relevant to the scene content, e.g., 'wind howling' or 'door opening')."
+)
+
+PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "scenes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "narration": {"type": "string"},
+                    "visual_prompt": {"type": "string"},
+                    "duration_sec": {"type": "number"},
+                    "search_terms": {"type": "string"},
+                    "music_keywords": {"type": "string"},
+                    "sfx_keywords": {"type": "string"},
+                },
+                "required": [
+                    "title", 
+                    "narration", 
+                    "visual_prompt", 
+                    "duration_sec",
+                    "search_terms",
+                    "music_keywords",
+                    "sfx_keywords"
+                ],
+            },
+        }
+    },
+    "required": ["scenes"],
+}
+
+# Compiled once per process; None falls back to checking required keys by hand.
+_PLAN_VALIDATOR = fastjsonschema.compile(PLAN_SCHEMA) if fastjsonschema is not None else None
+
+
+def _loads(text: str) -> dict:
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
+
+def _validate_plan(body: dict) -> None:
+    """Raise RuntimeError unless ``body`` matches PLAN_SCHEMA."""
+    if _PLAN_VALIDATOR is not None:
+        try:
+            _PLAN_VALIDATOR(body)
+        except fastjsonschema.JsonSchemaException as e:
+            raise RuntimeError(f"LLM returned an invalid scene plan: {e.message}") from e
+        return
+    scenes = body.get("scenes") if isinstance(body, dict) else None
+    if not isinstance(scenes, list):
+        raise RuntimeError("LLM returned an invalid scene plan: missing 'scenes' array")
+    required = PLAN_SCHEMA["properties"]["scenes"]["items"]["required"]
+    for raw in scenes:
+        missing = [key for key in required if not isinstance(raw, dict) or key not in raw]
+        if missing:
+            raise RuntimeError(f"LLM returned an invalid scene plan: scene missing {', '.join(missing)}")
+
+
+def _checked(body: dict) -> dict:
+    """``body`` once it is a usable plan; an empty one is rejected here so it is never cached either."""
+    _validate_plan(body)
+    if not body["scenes"]:
+        raise RuntimeError("LLM returned no scenes")
+    return body
+
+
+# Relative difference between planned and requested length left as is.
+RESCALE_TOLERANCE = 0.02
+
 
 class ScenePlanner:
-    def __init__(self, client: genai.Client, model: str):
+    """
+    Asks the text model for a scene breakdown of a prompt.
+
+    The static instruction goes in as the system instruction, ahead of the
+    per-request topic line. It is a few hundred tokens, below Gemini's minimum
+    cacheable size (and ``-latest`` aliases cannot be cached at all), so no
+    explicit context cache is created for it.
+
+    With a ``cache``, the model's JSON answer is stored under a hash of the
+    model, request and schema, so asking for the same plan again within
+    ``cache_ttl`` seconds skips the LLM round trip.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model: str,
+        cache: Optional[DiskCache] = None,
+        cache_ttl: Optional[float] = None,
+    ):
         self.client = client
         self.model = model
+        self.cache = cache
+        self.cache_ttl = cache_ttl
 
-    def plan(self, prompt: str, total_duration: int, target_scenes: int) -> List[Scene]:
-        instruction = (
-            "You are a film director. Break the topic into short scenes. "
-            "Return JSON with a 'scenes' array only. Each scene needs: "
-            "title, narration (2-3 sentences), visual_prompt, duration_sec "
-            f"(so total is close to {total_duration} seconds), search_terms "
-            "(short keyword string <= 5 words for stock image search), "
-            "music_keywords (short keyword string <= 6 words describing the background music mood/genre, e.g., 'ambient cinematic soft'), and "
-            "sfx_keywords (short keyword string <= 3 words for a scene-specific sound effect relevant to the scene content, e.g., 'wind howling' or 'door opening')."
-        )
-        
-        full_prompt = f"{instruction}\n\nTopic: {prompt}\nTarget scenes: {target_scenes}"
-
-        schema = {
-            "type": "object",
-            "properties": {
-                "scenes": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "title": {"type": "string"},
-                            "narration": {"type": "string"},
-                            "visual_prompt": {"type": "string"},
-                            "duration_sec": {"type": "number"},
-                            "search_terms": {"type": "string"},
-                            "music_keywords": {"type": "string"},
-                            "sfx_keywords": {"type": "string"},
-                        },
-                        "required": [
-                            "title", 
-                            "narration", 
-                            "visual_prompt", 
-                            "duration_sec",
-                            "search_terms",
-                            "music_keywords",
-                            "sfx_keywords"
-                        ],
-                    },
-                }
-            },
-            "required": ["scenes"],
+    def _generate(self, request: str) -> dict:
+        contents = [{"role": "user", "parts": [{"text": request}]}]
+        config = {
+            "system_instruction": PLAN_INSTRUCTION,
+            "response_mime_type": "application/json",
+            "response_json_schema": PLAN_SCHEMA,
         }
+        response = self.client.models.generate_content(model=self.model, contents=contents, config=config)
+        return _loads(response.text)
 
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=[
-                {
-                    "role": "user",
-                    "parts": [{"text": full_prompt}],
-                },
-            ],
-            config={
-                "response_mime_type": "application/json",
-                "response_json_schema": schema,
-            },
-        )
+    def plan(self, prompt: str, total_duration: int, target_scenes: int) -> List[Scene]:
+        request = f"Topic: {prompt}\nTarget scenes: {target_scenes}\nTotal seconds: {total_duration}"
 
-        body = json.loads(response.text)
+        if self.cache:
+            key = hashlib.sha256(
+                json.dumps(
+                    {"model": self.model, "instruction": PLAN_INSTRUCTION, "request": request, "schema": PLAN_SCHEMA},
+                    sort_keys=True,
+                ).encode()
+            ).hexdigest()
+            # Validated inside the fetcher, so a malformed plan is never written to the cache.
+            body = self.cache.json(f"plan-{key}", lambda: _checked(self._generate(request)), ttl=self.cache_ttl)
+        else:
+            body = _checked(self._generate(request))
 
         scenes = []
-        for raw in body.get("scenes", []):
-            search_terms = raw.get("search_terms") if isinstance(raw, dict) else None
-            music_keywords = raw.get("music_keywords") if isinstance(raw, dict) else None
-            sfx_keywords = raw.get("sfx_keywords") if isinstance(raw, dict) else None
+        for raw in body["scenes"]:
+            search_terms = raw["search_terms"]
+            music_keywords = raw["music_keywords"]
+            sfx_keywords = raw["sfx_keywords"]
             print(f"[Planner] Scene parsed - music_keywords: '{music_keywords}', sfx_keywords: '{sfx_keywords}'")
             scenes.append(
                 Scene(
@@ -92,7 +170,8 @@ class ScenePlanner:
             raise RuntimeError("LLM returned no scenes")
         scenes = scenes[:target_scenes]
         total = sum(s.duration_sec for s in scenes)
-        if total > 0:
+        # Within RESCALE_TOLERANCE of the target the model already did the job.
+        if total > 0 and abs(total - total_duration) > RESCALE_TOLERANCE * total_duration:
             scale = float(total_duration) / total
             for s in scenes:
                 s.duration_sec = max(3.0, s.duration_sec * scale)
@@ -102,10 +181,11 @@ class ScenePlanner:
 class PromptBuilder:
     def __init__(self, global_style: str):
         self.global_style = global_style
+        # Same for every scene, so it is formatted once.
+        self._suffix = (
+            ". Shot composition: cinematic 16:9, gentle camera movement. "
+            f"Style: {global_style}."
+        )
 
     def build(self, scene: Scene) -> str:
-        return (
-            f"{scene.visual_prompt}. "
-            f"Shot composition: cinematic 16:9, gentle camera movement. "
-            f"Style: {self.global_style}."
-        )
+        return scene.visual_prompt + self._suffix
@@ -1,23 +1,66 @@
+import os
+from pathlib import Path
+from urllib.parse import quote
+
 from flask import Flask, jsonify, render_template, request, send_file, redirect, url_for
-import threading
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.utils import safe_join
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-from .config import Settings
+from .cache import DiskCache
+from .config import Settings, get_settings, mask_secret_values
 from .config_store import ConfigStore
+from .jobs import RenderQueue
 from .pipeline import VideoPipeline
 from .storage import DataStore
 
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson; types orjson lacks go through Flask's default hook."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        # Same default as Flask's provider: keys sorted unless app.json.sort_keys is turned off.
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 def create_app(config_path: str | None = None, db_path: str | None = None) -> Flask:
     app = Flask(__name__)
+    if orjson is not None:
+        # jsonify and request.get_json both go through app.json.
+        app.json = ORJSONProvider(app)
     data_store = DataStore(db_path)
     config_store = ConfigStore(config_path)
 
     def current_settings() -> Settings:
-        return Settings.from_sources(config_store.load())
+        return get_settings(config_store.load())
 
     def build_pipeline() -> VideoPipeline:
         return VideoPipeline(current_settings())
 
+    render_queue = RenderQueue(data_store, build_pipeline, workers=current_settings().render_workers)
+
+    def run_status(run: dict) -> dict:
+        output_path = run.get("output_path")
+        download_url = None
+        if run.get("status") == "completed" and output_path:
+            download_url = url_for("download", filename=Path(output_path).name)
+        return {
+            "run_id": run["id"],
+            "status": run.get("status"),
+            "error": run.get("error"),
+            "download_url": download_url,
+        }
+
     @app.route("/api/render", methods=["POST"])
     def render_video():
         body = request.get_json(force=True, silent=True) or {}
@@ -33,60 +76,31 @@ def create_app(config_path: str | None = None, db_path: str | None = None) -> Fl
         if image_provider not in {"gemini", "stock"}:
             return jsonify({"error": "image_provider must be 'gemini' or 'stock'"}), 400
 
-        run_id = data_store.record_run(
-            prompt=prompt,
-            duration=duration,
-            scenes=scenes,
-            aspect=aspect,
-            image_provider=image_provider,
-            status="pending",
-        )
-
-        def _background_render(r_id, p, d, s, a, i):
-            try:
-                pipeline = build_pipeline()
-                output_path = pipeline.build_video_from_prompt(p, d, s, a, i)
-                
-                # Attempt S3 Upload
-                settings = pipeline.settings
-                if settings.s3_bucket_name and settings.aws_access_key_id and settings.aws_secret_access_key:
-                    try:
-                        from .s3_uploader import S3Uploader
-                        uploader = S3Uploader(
-                            settings.aws_access_key_id,
-                            settings.aws_secret_access_key,
-                            settings.aws_region,
-                            settings.s3_bucket_name
-                        )
-                        s3_url = uploader.upload(output_path, settings.s3_prefix)
-                        print(f"Successfully uploaded to S3: {s3_url}")
-                    except Exception as e:
-                        print(f"Warning: S3 Upload failed: {e}")
-
-                data_store.update_run(r_id, status="completed", output_path=str(output_path))
-            except Exception as exc:
-                data_store.update_run(r_id, status="failed", error=str(exc))
-                print(f"Background render failed for run {r_id}: {exc}")
-
-        thread = threading.Thread(
-            target=_background_render,
-            args=(run_id, prompt, duration, scenes, aspect, image_provider),
+        run_id, reused = render_queue.submit(prompt, duration, scenes, aspect, image_provider)
+        return jsonify(
+            {
+                "status": "submitted",
+                "run_id": run_id,
+                "cached": reused,
+                "status_url": url_for("run_status_api", run_id=run_id),
+                "message": "Matching render already exists" if reused else "Video generation queued",
+            }
         )
-        thread.start()
 
-        return jsonify({"status": "submitted", "run_id": run_id, "message": "Video generation started in background"})
+    @app.route("/api/status/<run_id>", methods=["GET"])
+    def run_status_api(run_id: str):
+        run = data_store.get_run(run_id)
+        if not run:
+            return jsonify({"error": "run not found"}), 404
+        return jsonify(run_status(run))
 
     @app.route("/api/config", methods=["GET"])
     def get_config():
         settings = current_settings()
-        overrides = config_store.load()
-        for key in ("GOOGLE_API_KEY", "PIXABAY_KEY", "FREESOUND_KEY"):
-            if key in overrides and overrides[key]:
-                overrides[key] = f"{overrides[key][:4]}***"
         return jsonify(
             {
                 "config": settings.to_public_dict(mask_secrets=True),
-                "overrides": overrides,
+                "overrides": mask_secret_values(config_store.load()),
             }
         )
 
@@ -94,15 +108,32 @@ def create_app(config_path: str | None = None, db_path: str | None = None) -> Fl
     def update_config():
         payload = request.get_json(force=True, silent=True) or {}
         saved = config_store.update(payload)
-        settings = Settings.from_sources(saved)
+        settings = get_settings(saved)
         return jsonify({"status": "ok", "config": settings.to_public_dict(mask_secrets=True)})
 
+    @app.route("/api/cache/clear", methods=["POST"])
+    def clear_cache():
+        DiskCache(current_settings().cache_dir).clear()
+        return jsonify({"status": "ok"})
+
     @app.route("/api/download/<path:filename>", methods=["GET"])
     def download(filename: str):
-        path = current_settings().output_dir / filename
-        if not path.exists():
+        settings = current_settings()
+        safe_name = safe_join(str(settings.output_dir), filename)
+        path = Path(safe_name) if safe_name else None
+        if not path or not path.is_file():
             return jsonify({"error": "file not found"}), 404
-        return send_file(path, mimetype="video/mp4", as_attachment=True)
+        if settings.download_accel_prefix:
+            # Let the fronting nginx stream the file from its internal location.
+            response = app.response_class(mimetype="video/mp4")
+            # Built from the validated path, percent-encoded so nginx sees exactly that file.
+            relative = Path(os.path.relpath(safe_name, settings.output_dir)).as_posix()
+            response.headers["X-Accel-Redirect"] = settings.download_accel_prefix.rstrip("/") + "/" + quote(relative)
+            response.headers["Content-Disposition"] = f'attachment; filename="{path.name}"'
+            return response
+        # Conditional responses answer Range and If-None-Match requests, so
+        # downloads can resume and the WSGI file wrapper can use sendfile().
+        return send_file(path, mimetype="video/mp4", as_attachment=True, conditional=True, etag=True)
 
     @app.route("/health", methods=["GET"])
     def health():
@@ -120,7 +151,7 @@ def create_app(config_path: str | None = None, db_path: str | None = None) -> Fl
         scenes = 5
         aspect = settings.default_aspect
         image_provider = "stock"
-        video_path = None
+        run_id = None
         error = None
         if request.method == "POST":
             form = request.form or {}
@@ -132,24 +163,7 @@ def create_app(config_path: str | None = None, db_path: str | None = None) -> Fl
             if not prompt:
                 error = "Prompt is required."
             else:
-                run_id = data_store.record_run(
-                    prompt=prompt,
-                    duration=duration,
-                    scenes=scenes,
-                    aspect=aspect,
-                    image_provider=image_provider,
-                    status="pending",
-                )
-                try:
-                    output_path = build_pipeline().build_video_from_prompt(
-                        prompt, duration, scenes, aspect, image_provider
-                    )
-                    data_store.update_run(run_id, status="completed", output_path=str(output_path))
-                    video_path = output_path
-                except Exception as exc:  # noqa: BLE001
-                    data_store.update_run(run_id, status="failed", error=str(exc))
-                    error = str(exc)
-
+                run_id, _ = render_queue.submit(prompt, duration, scenes, aspect, image_provider)
         return render_template(
             "index.html",
             prompt=prompt,
@@ -157,7 +171,7 @@ def create_app(config_path: str | None = None, db_path: str | None = None) -> Fl
             scenes=scenes,
             aspect=aspect,
             image_provider=image_provider,
-            video_path=video_path,
+            run_id=run_id,
             error=error,
             settings=settings,
         )
@@ -6,6 +6,19 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Optional
 
+RUN_COLUMNS = (
+    "id",
+    "prompt",
+    "duration",
+    "scenes",
+    "aspect",
+    "image_provider",
+    "output_path",
+    "status",
+    "error",
+    "created_at",
+)
+
 
 def default_data_dir() -> Path:
     path = Path(os.getenv("GVA_DATA_DIR", Path.home() / ".gemini_video_assemble"))
@@ -53,10 +66,18 @@ class DataStore:
                     output_path TEXT,
                     status TEXT,
                     error TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    request_key TEXT,
+                    owner TEXT
                 )
                 """
             )
+            # Databases created before these columns existed.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(runs)")}
+            for column in ("request_key", "owner"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE runs ADD COLUMN {column} TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS runs_request_key ON runs(request_key)")
 
     # Config helpers
     def get_config(self) -> Dict[str, str]:
@@ -85,18 +106,47 @@ class DataStore:
         status: str = "pending",
         output_path: Optional[str] = None,
         error: Optional[str] = None,
+        request_key: Optional[str] = None,
+        owner: Optional[str] = None,
     ) -> str:
         run_id = str(uuid.uuid4())
         with self._conn() as conn:
             conn.execute(
                 """
-                INSERT INTO runs(id, prompt, duration, scenes, aspect, image_provider, output_path, status, error)
-                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO runs(
+                    id, prompt, duration, scenes, aspect, image_provider, output_path, status, error,
+                    request_key, owner
+                )
+                VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (run_id, prompt, duration, scenes, aspect, image_provider, output_path, status, error),
+                (
+                    run_id, prompt, duration, scenes, aspect, image_provider, output_path, status, error,
+                    request_key, owner,
+                ),
             )
         return run_id
 
+    def unfinished_runs(self) -> List[Dict[str, str]]:
+        """``id`` and ``owner`` of every run still marked pending or running."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT id, owner FROM runs WHERE status IN ('pending', 'running')"
+            ).fetchall()
+            return [{"id": run_id, "owner": owner} for run_id, owner in rows]
+
+    def find_runs(self, request_key: str, max_age_sec: int) -> List[Dict[str, str]]:
+        """Runs recorded for ``request_key`` in the last ``max_age_sec`` seconds, newest first."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, prompt, duration, scenes, aspect, image_provider, output_path, status, error, created_at
+                FROM runs WHERE request_key=? AND datetime(created_at) >= datetime('now', ?)
+                ORDER BY datetime(created_at) DESC
+                """,
+                (request_key, f"-{int(max_age_sec)} seconds"),
+            ).fetchall()
+            return [dict(zip(RUN_COLUMNS, row)) for row in rows]
+
     def update_run(self, run_id: str, status: str, output_path: Optional[str] = None, error: Optional[str] = None):
         with self._conn() as conn:
             conn.execute(
@@ -107,6 +157,17 @@ class DataStore:
                 (status, output_path, error, run_id),
             )
 
+    def get_run(self, run_id: str) -> Optional[Dict[str, str]]:
+        with self._conn() as conn:
+            row = conn.execute(
+                """
+                SELECT id, prompt, duration, scenes, aspect, image_provider, output_path, status, error, created_at
+                FROM runs WHERE id=?
+                """,
+                (run_id,),
+            ).fetchone()
+            return dict(zip(RUN_COLUMNS, row)) if row else None
+
     def list_runs(self, limit: int = 25) -> List[Dict[str, str]]:
         with self._conn() as conn:
             rows = conn.execute(
@@ -116,19 +177,7 @@ class DataStore:
                 """,
                 (limit,),
             ).fetchall()
-            columns = [
-                "id",
-                "prompt",
-                "duration",
-                "scenes",
-                "aspect",
-                "image_provider",
-                "output_path",
-                "status",
-                "error",
-                "created_at",
-            ]
-            return [dict(zip(columns, row)) for row in rows]
+            return [dict(zip(RUN_COLUMNS, row)) for row in rows]
 
     def purge(self, delete_outputs: bool = False, output_dir: Optional[Path] = None) -> None:
         if self.path.exists():
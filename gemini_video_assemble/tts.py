@@ -1,18 +1,35 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from gtts import gTTS
 
+from .fileio import WRITE_BUFFER_SIZE, open_atomic
+
 try:
     import boto3
 except ImportError:
     boto3 = None
 
 
+# Narrations synthesized at once by synthesize_many.
+SYNTHESIZE_MANY_WORKERS = 8
+
+
 class TTSSynthesizer:
     def synthesize(self, text: str, dest: Path) -> Path:
         raise NotImplementedError
 
+    def synthesize_many(self, texts: List[str], dests: List[Path]) -> List[Path]:
+        """Synthesize each text to its destination; requests are independent, so they run concurrently."""
+        if len(texts) != len(dests):
+            raise ValueError("texts and dests must have the same length")
+        if not texts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(SYNTHESIZE_MANY_WORKERS, len(texts))) as pool:
+            return list(pool.map(self.synthesize, texts, dests))
+
 
 class GoogleTTSSynthesizer(TTSSynthesizer):
     """
@@ -24,7 +41,8 @@ class GoogleTTSSynthesizer(TTSSynthesizer):
 
     def synthesize(self, text: str, dest: Path) -> Path:
         tts = gTTS(text=text, lang=self.lang)
-        tts.save(str(dest))
+        with open_atomic(dest) as fh:
+            tts.write_to_fp(fh)
         return dest
 
 
@@ -61,10 +79,13 @@ class AmazonPollySynthesizer(TTSSynthesizer):
             Engine=self.engine,
         )
 
-        if "AudioStream" in response:
-            with open(dest, "wb") as f:
-                f.write(response["AudioStream"].read())
-        else:
+        if "AudioStream" not in response:
             raise RuntimeError("Could not stream audio from Amazon Polly")
-        
+        stream = response["AudioStream"]
+        try:
+            with open_atomic(dest) as fh:
+                shutil.copyfileobj(stream, fh, WRITE_BUFFER_SIZE)
+        finally:
+            stream.close()
+
         return dest
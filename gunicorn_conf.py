@@ -0,0 +1,17 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn_conf.py "app:create_app()"``.
+
+Renders run on each worker's in-process queue (RENDER_WORKERS), so request
+handlers only validate input and read run status. Threaded workers cover
+that; the ``gevent`` worker class also works and patches sockets itself.
+"""
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+# Only used by the gevent/eventlet worker classes.
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "64"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+accesslog = "-"
+errorlog = "-"
@@ -0,0 +1,90 @@
+import os
+import time
+
+import pytest
+
+from gemini_video_assemble.cache import DiskCache, request_key
+
+
+def test_request_key_ignores_param_order():
+    url = "https://pixabay.com/api/"
+    assert request_key(url, {"q": "sea", "page": 1}) == request_key(url, {"page": 1, "q": "sea"})
+    assert request_key(url, {"q": "sea"}) != request_key(url, {"q": "sky"})
+
+
+def test_json_fetches_once(tmp_path):
+    cache = DiskCache(tmp_path)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return {"hits": [1, 2]}
+
+    assert cache.json("k", fetch) == {"hits": [1, 2]}
+    assert cache.json("k", fetch) == {"hits": [1, 2]}
+    assert len(calls) == 1
+
+
+def test_json_refetches_after_ttl(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.json("k", lambda: {"v": 1}, ttl=60)
+    stale = time.time() - 120
+    os.utime(cache.json_dir / "k.json", (stale, stale))
+
+    assert cache.json("k", lambda: {"v": 2}, ttl=60) == {"v": 2}
+    # Without a TTL the entry never expires.
+    os.utime(cache.json_dir / "k.json", (stale, stale))
+    assert cache.json("k", lambda: {"v": 3}) == {"v": 2}
+
+
+def test_json_failed_write_leaves_no_temp_file(tmp_path):
+    cache = DiskCache(tmp_path)
+
+    with pytest.raises(TypeError):
+        cache.json("k", lambda: {"v": object()})
+
+    assert list(cache.json_dir.iterdir()) == []
+
+
+def test_blob_downloads_once_and_links_hits(tmp_path):
+    cache = DiskCache(tmp_path / "cache")
+    calls = []
+
+    def download(dest):
+        calls.append(dest)
+        dest.write_bytes(b"payload")
+        return dest
+
+    first = cache.blob("https://cdn/a.jpg", tmp_path / "one.jpg", download)
+    second = cache.blob("https://cdn/a.jpg", tmp_path / "two.jpg", download)
+
+    assert len(calls) == 1
+    assert first.read_bytes() == second.read_bytes() == b"payload"
+
+
+def test_blob_evicts_least_recently_used_past_max_bytes(tmp_path):
+    cache = DiskCache(tmp_path / "cache", max_bytes=10)
+
+    def writer(data):
+        def download(dest):
+            dest.write_bytes(data)
+            return dest
+
+        return download
+
+    cache.blob("https://cdn/old", tmp_path / "old", writer(b"123456"))
+    old_entry = cache.blob_dir / request_key("https://cdn/old")
+    os.utime(old_entry, (1, 1))
+    cache.blob("https://cdn/new", tmp_path / "new", writer(b"654321"))
+
+    assert not old_entry.exists()
+    assert (cache.blob_dir / request_key("https://cdn/new")).exists()
+
+
+def test_clear_drops_everything(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.json("k", lambda: {"v": 1})
+
+    cache.clear()
+
+    assert cache.json("k", lambda: {"v": 2}) == {"v": 2}
@@ -0,0 +1,54 @@
+from gemini_video_assemble.ffmpeg_tools import FilterGraph, escape_filter_value
+
+
+def test_escape_filter_value_leaves_plain_text():
+    assert escape_filter_value("Hello world") == "Hello world"
+
+
+def test_escape_filter_value_escapes_both_levels():
+    # ':' is special to the option parser, so it is escaped once and that escape again.
+    assert escape_filter_value("a:b") == r"a\\:b"
+    assert escape_filter_value("it's") == r"it\\\'s"
+    # Filtergraph separators only need the outer level.
+    assert escape_filter_value("[x];y,z") == r"\[x\]\;y\,z"
+    assert escape_filter_value("C:\\fonts") == r"C\\:\\\\fonts"
+
+
+def test_add_input_numbers_inputs_in_order():
+    graph = FilterGraph()
+
+    assert graph.add_input("-i", "a.png") == 0
+    assert graph.add_input("-i", "b.mp3") == 1
+    graph.add("[0:v]null[v]")
+    assert graph.args() == ["-i", "a.png", "-i", "b.mp3", "-filter_complex", "[0:v]null[v]"]
+
+
+def test_join_single_segment_is_passthrough():
+    graph = FilterGraph()
+
+    assert graph.join([("[v0]", "[a0]", 3.0)], crossfade_sec=0.5) == ("[v0]", "[a0]")
+    assert graph.filters == []
+
+
+def test_join_without_crossfade_concatenates():
+    graph = FilterGraph()
+
+    pads = graph.join([("[v0]", "[a0]", 3.0), ("[v1]", "[a1]", 2.0)], crossfade_sec=0)
+
+    assert pads == ("[vjoin]", "[ajoin]")
+    assert graph.filters == ["[v0][a0][v1][a1]concat=n=2:v=1:a=1[vjoin][ajoin]"]
+
+
+def test_join_crossfades_at_running_offsets():
+    graph = FilterGraph()
+    segments = [("[v0]", "[a0]", 3.0), ("[v1]", "[a1]", 2.0), ("[v2]", "[a2]", 4.0)]
+
+    pads = graph.join(segments, crossfade_sec=0.5)
+
+    assert pads == ("[vx2]", "[ax2]")
+    assert graph.filters == [
+        "[v0][v1]xfade=transition=fade:duration=0.5:offset=2.500[vx1]",
+        "[a0][a1]acrossfade=d=0.5[ax1]",
+        "[vx1][v2]xfade=transition=fade:duration=0.5:offset=4.000[vx2]",
+        "[ax1][a2]acrossfade=d=0.5[ax2]",
+    ]
@@ -0,0 +1,60 @@
+import pytest
+
+from gemini_video_assemble.fileio import atomic_write, move_into_place, stream_to_file
+
+
+class FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+
+    def close(self):
+        self.closed = True
+
+
+def test_atomic_write_replaces_without_leftovers(tmp_path):
+    dest = tmp_path / "out.bin"
+    dest.write_bytes(b"old")
+
+    atomic_write(dest, b"new contents")
+
+    assert dest.read_bytes() == b"new contents"
+    assert [p.name for p in tmp_path.iterdir()] == ["out.bin"]
+
+
+def test_move_into_place(tmp_path):
+    src = tmp_path / "src.mp4"
+    src.write_bytes(b"video")
+
+    dest = move_into_place(src, tmp_path / "dest.mp4")
+
+    assert dest.read_bytes() == b"video"
+    assert not src.exists()
+
+
+def test_stream_to_file_writes_complete_body(tmp_path):
+    response = FakeResponse([b"ab", b"cd"])
+
+    assert stream_to_file(response, tmp_path / "f", min_bytes=4) == 4
+    assert (tmp_path / "f").read_bytes() == b"abcd"
+    assert response.closed
+
+
+def test_stream_to_file_rejects_short_body(tmp_path):
+    with pytest.raises(RuntimeError):
+        stream_to_file(FakeResponse([b"ab"]), tmp_path / "f", min_bytes=10)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_stream_to_file_rejects_invalid_body(tmp_path):
+    def validate(path):
+        raise ValueError("corrupt")
+
+    with pytest.raises(ValueError):
+        stream_to_file(FakeResponse([b"abcd"]), tmp_path / "f", validate=validate)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,98 @@
+import socket
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+from gemini_video_assemble.jobs import RenderQueue
+from gemini_video_assemble.storage import DataStore
+
+REQUEST = ("a lighthouse at dawn", 30, 4, "horizontal", "gemini")
+
+
+class FakePipeline:
+    def __init__(self, output, release=None):
+        self.output = output
+        self.release = release
+        self.settings = SimpleNamespace(s3_bucket_name=None)
+        self.calls = 0
+
+    def build_video_from_prompt(self, *args):
+        self.calls += 1
+        if self.release is not None:
+            self.release.wait(5)
+        self.output.write_bytes(b"video")
+        return self.output
+
+
+def make_queue(tmp_path, pipeline):
+    store = DataStore(tmp_path / "runs.db")
+    return store, RenderQueue(store, lambda: pipeline)
+
+
+def test_identical_request_reuses_in_flight_run(tmp_path):
+    release = threading.Event()
+    pipeline = FakePipeline(tmp_path / "out.mp4", release)
+    store, queue = make_queue(tmp_path, pipeline)
+
+    run_id, reused = queue.submit(*REQUEST)
+    future = queue._futures[run_id]
+    again, reused_again = queue.submit(*REQUEST)
+    release.set()
+    future.result(5)
+
+    assert (reused, reused_again) == (False, True)
+    assert again == run_id
+    assert pipeline.calls == 1
+    assert store.get_run(run_id)["status"] == "completed"
+
+
+def test_completed_run_is_reused_only_while_its_video_exists(tmp_path):
+    release = threading.Event()
+    pipeline = FakePipeline(tmp_path / "out.mp4", release)
+    store, queue = make_queue(tmp_path, pipeline)
+    run_id, _ = queue.submit(*REQUEST)
+    future = queue._futures[run_id]
+    release.set()
+    future.result(5)
+
+    assert queue.submit(*REQUEST) == (run_id, True)
+
+    pipeline.output.unlink()
+    new_id, reused = queue.submit(*REQUEST)
+    assert not reused and new_id != run_id
+
+
+def test_different_request_renders_again(tmp_path):
+    store, queue = make_queue(tmp_path, FakePipeline(tmp_path / "out.mp4"))
+
+    first, _ = queue.submit(*REQUEST)
+    second, reused = queue.submit("a lighthouse at dusk", *REQUEST[1:])
+
+    assert not reused and second != first
+
+
+def test_request_key_depends_on_every_parameter():
+    key = RenderQueue.request_key(*REQUEST)
+
+    assert key == RenderQueue.request_key(*REQUEST)
+    assert key != RenderQueue.request_key(REQUEST[0], 31, *REQUEST[2:])
+
+
+def test_start_fails_runs_left_by_dead_or_unknown_owners(tmp_path):
+    store = DataStore(tmp_path / "runs.db")
+    args = dict(prompt="p", duration=10, scenes=2, aspect="horizontal", image_provider="gemini")
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    orphan = store.record_run(**args, owner=None)
+    dead = store.record_run(**args, owner=f"{socket.gethostname()}:{finished.pid}")
+    elsewhere = store.record_run(**args, owner="another-host:1")
+
+    queue = RenderQueue(store, lambda: None)
+    alive = store.record_run(**args, owner=queue.owner)
+    RenderQueue(store, lambda: None)
+
+    assert store.get_run(orphan)["status"] == "failed"
+    assert store.get_run(dead)["status"] == "failed"
+    assert store.get_run(elsewhere)["status"] == "pending"
+    assert store.get_run(alive)["status"] == "pending"
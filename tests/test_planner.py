@@ -0,0 +1,55 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from gemini_video_assemble.cache import DiskCache
+from gemini_video_assemble.planner import ScenePlanner, _checked
+
+SCENE = {
+    "title": "Dawn",
+    "narration": "The light returns.",
+    "visual_prompt": "a lighthouse at dawn",
+    "duration_sec": 10,
+    "search_terms": "lighthouse dawn",
+    "music_keywords": "ambient soft",
+    "sfx_keywords": "waves",
+}
+
+
+class FakeClient:
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+
+    def _generate_content(self, **kwargs):
+        return SimpleNamespace(text=json.dumps(self.bodies.pop(0)))
+
+
+def test_checked_accepts_a_complete_plan():
+    body = {"scenes": [SCENE]}
+
+    assert _checked(body) is body
+
+
+def test_checked_rejects_empty_and_incomplete_plans():
+    with pytest.raises(RuntimeError, match="no scenes"):
+        _checked({"scenes": []})
+    incomplete = {k: v for k, v in SCENE.items() if k != "narration"}
+    with pytest.raises(RuntimeError, match="invalid scene plan"):
+        _checked({"scenes": [incomplete]})
+
+
+def test_invalid_plan_is_not_cached(tmp_path):
+    cache = DiskCache(tmp_path)
+    client = FakeClient({"scenes": []}, {"scenes": [SCENE, SCENE]})
+    planner = ScenePlanner(client, "gemini-test", cache=cache, cache_ttl=60)
+
+    with pytest.raises(RuntimeError):
+        planner.plan("lighthouse", 20, 2)
+    scenes = planner.plan("lighthouse", 20, 2)
+
+    assert [scene.title for scene in scenes] == ["Dawn", "Dawn"]
+    # The second plan came from the model, and now a repeat is served from the cache.
+    assert len(planner.plan("lighthouse", 20, 2)) == 2
+    assert client.bodies == []